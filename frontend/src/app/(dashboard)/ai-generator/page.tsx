@@ -52,7 +52,7 @@ import type {
   ToneOption,
   OutputFormatOption,
 } from "@/types/ai";
-import type { GeneratePromptResponse } from "@/lib/services/ai.service";
+import type { GeneratePromptResponse } from "@/lib/api/ai";
 
 type FormState = {
   goal: string;
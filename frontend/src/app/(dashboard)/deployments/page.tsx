@@ -62,6 +62,8 @@ export default function DeploymentsPage() {
     Environment | "all"
   >(envParam);
   const [historyPage, setHistoryPage] = useState(0);
+  // Keyset cursors for single-environment history: entry i starts page i + 1
+  const [historyCursors, setHistoryCursors] = useState<string[]>([]);
   const limit = 5;
 
   useEffect(() => {
@@ -84,6 +86,10 @@ export default function DeploymentsPage() {
     });
   }, [envParam]);
 
+  useEffect(() => {
+    setHistoryCursors([]);
+  }, [historyEnvironmentFilter, promptFilter]);
+
   const { data: promptData, isLoading: promptOptionsLoading } =
     useGetPromptsQuery({
       owned: true,
@@ -91,6 +97,7 @@ export default function DeploymentsPage() {
       sort_by: "name",
       order: "asc",
       limit: 100,
+      with_count: false,
     });
 
   const promptOptions = useMemo(() => (promptData?.items ?? []) as any[], [promptData]);
@@ -190,6 +197,7 @@ export default function DeploymentsPage() {
         limit,
         offset: historyPage * limit,
         promptName: promptFilter || undefined,
+        before: historyPage > 0 ? historyCursors[historyPage - 1] : undefined,
       },
     );
 
@@ -470,7 +478,17 @@ export default function DeploymentsPage() {
                     <Button
                       variant="outline"
                       size="sm"
-                      onClick={() => setHistoryPage((p) => p + 1)}
+                      onClick={() => {
+                        const nextCursor =
+                          !shouldFetchAll && historyDataFiltered?.next_cursor;
+                        if (nextCursor) {
+                          setHistoryCursors((cursors) => [
+                            ...cursors.slice(0, historyPage),
+                            nextCursor,
+                          ]);
+                        }
+                        setHistoryPage((p) => p + 1);
+                      }}
                       disabled={!historyData.has_next}
                     >
                       Next
@@ -15,6 +15,8 @@ import { toast } from "sonner";
 import Link from "next/link";
 import { Alert, AlertDescription } from "@/components/ui/alert";
 
+const VARIABLE_REGEX = /\{\{(\w+)\}\}/g;
+
 export default function NewPromptPage() {
   const router = useRouter();
   const [name, setName] = useState("");
@@ -26,15 +28,8 @@ export default function NewPromptPage() {
 
   // Auto-detect variables from template
   useEffect(() => {
-    const matches = template.match(/\{\{(\w+)\}\}/g);
-    if (matches) {
-      const extractedVars = Array.from(
-        new Set(matches.map((m) => m.replace(/\{\{|\}\}/g, ""))),
-      );
-      setVariables(extractedVars);
-    } else {
-      setVariables([]);
-    }
+    const names = Array.from(template.matchAll(VARIABLE_REGEX), (m) => m[1]);
+    setVariables(Array.from(new Set(names)));
   }, [template]);
 
   const validate = () => {
@@ -58,6 +58,7 @@ export function DeployModal({
     sort_by: "name",
     order: "asc",
     limit: 100,
+    with_count: false,
   });
 
   const { data: versionsData, isLoading: versionsLoading } =
@@ -28,7 +28,11 @@ import {
 } from "@/components/ui/alert-dialog";
 import { useDeleteExperimentMutation } from "@/hooks/useExperiments";
 import { cn } from "@/lib/utils";
-import { abService } from "@/lib/services/ab.service";
+import {
+  get_experiment_stats,
+  get_policy_by_name,
+} from "@/lib/api/experiments";
+import { experiments_keys } from "@/lib/api/experiments-keys";
 import { useUserId } from "@/hooks/auth/useAuth";
 
 interface ExperimentCardProps {
@@ -51,17 +55,17 @@ export function ExperimentCard({ experiment }: ExperimentCardProps) {
 
     // Prefetch experiment detail
     queryClient.prefetchQuery({
-      queryKey: ["experiments", "detail", promptName],
+      queryKey: experiments_keys.detail(promptName),
       queryFn: async () => {
-        return abService.getPolicyByName(promptName, userId);
+        return get_policy_by_name(promptName, userId);
       },
     });
 
     // Prefetch experiment stats
     queryClient.prefetchQuery({
-      queryKey: ["experiments", "results", promptName],
+      queryKey: experiments_keys.results(promptName),
       queryFn: async () => {
-        return abService.getExperimentStats(promptName, userId);
+        return get_experiment_stats(promptName, userId);
       },
     });
   };
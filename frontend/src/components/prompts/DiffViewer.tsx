@@ -20,51 +20,85 @@ function buildDiff(original: string, updated: string): DiffEntry[] {
   const originalLines = original.split("\n");
   const updatedLines = updated.split("\n");
 
-  const m = originalLines.length;
-  const n = updatedLines.length;
+  // Edits usually touch a few lines, so only the region between the common
+  // prefix and suffix goes through the quadratic LCS table
+  let start = 0;
+  while (
+    start < originalLines.length &&
+    start < updatedLines.length &&
+    originalLines[start] === updatedLines[start]
+  ) {
+    start += 1;
+  }
 
-  const lcs: number[][] = Array.from({ length: m + 1 }, () =>
-    Array.from({ length: n + 1 }, () => 0),
-  );
+  let originalEnd = originalLines.length;
+  let updatedEnd = updatedLines.length;
+  while (
+    originalEnd > start &&
+    updatedEnd > start &&
+    originalLines[originalEnd - 1] === updatedLines[updatedEnd - 1]
+  ) {
+    originalEnd -= 1;
+    updatedEnd -= 1;
+  }
+
+  const m = originalEnd - start;
+  const n = updatedEnd - start;
+  const width = n + 1;
+
+  // Flat (m + 1) x (n + 1) table; lcs[i * width + j] is the LCS length of
+  // the middle lines from i and j onwards
+  const lcs = new Int32Array((m + 1) * width);
 
   for (let i = m - 1; i >= 0; i -= 1) {
     for (let j = n - 1; j >= 0; j -= 1) {
-      if (originalLines[i] === updatedLines[j]) {
-        lcs[i][j] = lcs[i + 1][j + 1] + 1;
+      if (originalLines[start + i] === updatedLines[start + j]) {
+        lcs[i * width + j] = lcs[(i + 1) * width + j + 1] + 1;
       } else {
-        lcs[i][j] = Math.max(lcs[i + 1][j], lcs[i][j + 1]);
+        lcs[i * width + j] = Math.max(
+          lcs[(i + 1) * width + j],
+          lcs[i * width + j + 1],
+        );
       }
     }
   }
 
   const diff: DiffEntry[] = [];
+  for (let k = 0; k < start; k += 1) {
+    diff.push({ type: "unchanged", value: originalLines[k] });
+  }
+
   let i = 0;
   let j = 0;
 
   while (i < m && j < n) {
-    if (originalLines[i] === updatedLines[j]) {
-      diff.push({ type: "unchanged", value: originalLines[i] });
+    if (originalLines[start + i] === updatedLines[start + j]) {
+      diff.push({ type: "unchanged", value: originalLines[start + i] });
       i += 1;
       j += 1;
-    } else if (lcs[i + 1][j] >= lcs[i][j + 1]) {
-      diff.push({ type: "removed", value: originalLines[i] });
+    } else if (lcs[(i + 1) * width + j] >= lcs[i * width + j + 1]) {
+      diff.push({ type: "removed", value: originalLines[start + i] });
       i += 1;
     } else {
-      diff.push({ type: "added", value: updatedLines[j] });
+      diff.push({ type: "added", value: updatedLines[start + j] });
       j += 1;
     }
   }
 
   while (i < m) {
-    diff.push({ type: "removed", value: originalLines[i] });
+    diff.push({ type: "removed", value: originalLines[start + i] });
     i += 1;
   }
 
   while (j < n) {
-    diff.push({ type: "added", value: updatedLines[j] });
+    diff.push({ type: "added", value: updatedLines[start + j] });
     j += 1;
   }
 
+  for (let k = originalEnd; k < originalLines.length; k += 1) {
+    diff.push({ type: "unchanged", value: originalLines[k] });
+  }
+
   return diff;
 }
 
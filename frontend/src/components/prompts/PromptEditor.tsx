@@ -44,15 +44,12 @@ export function PromptEditor({
   }, [prompt]);
 
   useEffect(() => {
-    const matches = template.match(VARIABLE_REGEX);
-    if (matches) {
-      const extracted = Array.from(
-        new Set(matches.map((match) => match.replace(/\{\{|\}\}/g, ""))),
-      );
-      setVariables(extracted);
-    } else {
-      setVariables([]);
-    }
+    // Runs on every keystroke: read names from the capture group in one scan
+    const names = Array.from(
+      template.matchAll(VARIABLE_REGEX),
+      (match) => match[1],
+    );
+    setVariables(Array.from(new Set(names)));
   }, [template]);
 
   const hasChanges = useMemo(() => {
@@ -8,6 +8,9 @@ import { Button } from "@/components/ui/button";
 import { Badge } from "@/components/ui/badge";
 import { Copy, Check } from "lucide-react";
 
+// Same names PromptEditor detects; only declared variables are substituted
+const VARIABLE_REGEX = /\{\{([\w.-]+)\}\}/g;
+
 interface PromptPreviewProps {
   template: string;
   variables: string[];
@@ -31,17 +34,13 @@ export function PromptPreview({ template, variables }: PromptPreviewProps) {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [variables]);
 
-  // Render template with variable values
+  // Render template with variable values in a single pass over the
+  // template; unknown or empty variables keep their placeholder
   const renderTemplate = () => {
-    let result = template;
-    variables.forEach((variable) => {
-      const value = values[variable] || `{{${variable}}}`;
-      result = result.replace(
-        new RegExp(`\\{\\{${variable}\\}\\}`, "g"),
-        value,
-      );
-    });
-    return result;
+    const declared = new Set(variables);
+    return template.replace(VARIABLE_REGEX, (placeholder, name: string) =>
+      declared.has(name) && values[name] ? values[name] : placeholder,
+    );
   };
 
   const rendered = renderTemplate();
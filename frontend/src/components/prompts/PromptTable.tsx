@@ -23,7 +23,8 @@ import { MoreVertical, Edit, Trash2, Eye, GitBranch, Copy } from "lucide-react";
 import type { Prompt } from "@/types/prompts";
 import { useRole } from "@/hooks/useRole";
 import { useAuth } from "@/hooks/auth/useAuth";
-import { promptsService } from "@/lib/services/prompts.service";
+import { get_active_prompt } from "@/lib/api/prompts";
+import { prompts_keys } from "@/lib/api/prompts-keys";
 import { useUserId } from "@/hooks/auth/useAuth";
 
 interface PromptTableProps {
@@ -44,10 +45,13 @@ export function PromptTable({ prompts, onDelete, onClone }: PromptTableProps) {
     if (!userId) return;
 
     queryClient.prefetchQuery({
-      queryKey: ["prompts", "detail", promptName, undefined],
+      queryKey: prompts_keys.detail(promptName),
       queryFn: async () => {
-        return promptsService.getActivePrompt(promptName, userId);
+        return get_active_prompt(promptName, userId);
       },
+      // Same freshness window as useGetPromptQuery, so hovering back and
+      // forth over the list reuses the cached row instead of refetching it
+      staleTime: 2 * 60 * 1000,
     });
   };
 
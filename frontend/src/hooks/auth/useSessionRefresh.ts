@@ -13,6 +13,18 @@ import { refresh_auth_session, get_session } from '@/lib/api/auth';
 import { useEffect, useState } from 'react';
 
 const REFRESH_BUFFER_MS = 60 * 1000; // Refresh 1 minute before expiration
+const REFRESH_JITTER = 0.1; // Spread refreshes over up to 10% earlier
+
+/**
+ * Time until the next refresh: when 80% of the session time has elapsed or
+ * 1 minute before expiry, pulled earlier by a random jitter so tabs that
+ * signed in together don't all refresh at the same moment
+ */
+function getRefreshTime(expiresAtSeconds: number): number {
+  const timeUntilExpiry = expiresAtSeconds * 1000 - Date.now();
+  const refreshTime = Math.min(timeUntilExpiry * 0.8, timeUntilExpiry - REFRESH_BUFFER_MS);
+  return refreshTime * (1 - Math.random() * REFRESH_JITTER);
+}
 
 export function use_session_refresh() {
   const { user } = use_auth_state();
@@ -34,12 +46,7 @@ export function use_session_refresh() {
         return;
       }
 
-      const expiresAt = new Date(session.expires_at).getTime();
-      const now = Date.now();
-      const timeUntilExpiry = expiresAt - now;
-
-      // Refresh when 80% of the session time has elapsed or 1 minute before expiry
-      const refreshTime = Math.min(timeUntilExpiry * 0.8, timeUntilExpiry - REFRESH_BUFFER_MS);
+      const refreshTime = getRefreshTime(session.expires_at);
 
       if (refreshTime > 0) {
         setRefreshInterval(refreshTime);
@@ -60,10 +67,7 @@ export function use_session_refresh() {
 
       if (session?.expires_at) {
         // Recalculate refresh interval after successful refresh
-        const expiresAt = new Date(session.expires_at).getTime();
-        const now = Date.now();
-        const timeUntilExpiry = expiresAt - now;
-        const refreshTime = Math.min(timeUntilExpiry * 0.8, timeUntilExpiry - REFRESH_BUFFER_MS);
+        const refreshTime = getRefreshTime(session.expires_at);
 
         if (refreshTime > 0) {
           setRefreshInterval(refreshTime);
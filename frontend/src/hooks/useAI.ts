@@ -5,8 +5,8 @@
  */
 
 import { useMutation } from "@tanstack/react-query";
-import { testsService } from "@/lib/services/tests.service";
 import { generate_prompt, type GeneratePromptParams } from "@/lib/api/ai";
+import { generate_test_cases } from "@/lib/api/tests";
 import { useUserId } from "@/hooks/auth/useAuth";
 
 /**
@@ -31,7 +31,7 @@ export function useGenerateTestsMutation() {
   return useMutation({
     mutationFn: async (params: { promptName: string; count: number }) => {
       if (!userId) throw new Error("Not authenticated");
-      return testsService.generateTestCases(
+      return generate_test_cases(
         params.promptName,
         userId,
         params.count,
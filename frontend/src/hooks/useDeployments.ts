@@ -13,12 +13,14 @@ import {
   type CreateDeploymentParams,
 } from "@/lib/api/deployments";
 import { deployments_keys } from "@/lib/api/deployments-keys";
+import { kpis_keys } from "@/lib/api/kpis-keys";
 import { useUserId } from "@/hooks/auth/useAuth";
 
 interface GetHistoryParams {
   limit?: number;
   offset?: number;
   promptName?: string;
+  before?: string;
 }
 
 /**
@@ -38,15 +40,21 @@ export function useGetDeploymentsHistoryQuery(
       environment,
       params.limit,
       params.offset,
-      params.promptName
+      params.promptName,
+      params.before
     ),
     queryFn: async () => {
       if (!userId || !environment) return null;
-      const items = await get_history(environment, userId, params);
+      const { items, has_next, next_cursor } = await get_history(
+        environment,
+        userId,
+        params
+      );
       return {
         items,
         count: items.length,
-        has_next: false,
+        has_next,
+        next_cursor,
         has_prev: false,
         limit: params.limit || 30,
         offset: params.offset || 0,
@@ -108,7 +116,11 @@ export function useGetAllDeploymentHistoryQuery(params: GetHistoryParams = {}) {
       ]);
 
       // Combine and sort by deployed_at
-      const combined = [...dev_data, ...staging_data, ...production_data].sort(
+      const combined = [
+        ...dev_data.items,
+        ...staging_data.items,
+        ...production_data.items,
+      ].sort(
         (a, b) =>
           new Date(b.deployed_at).getTime() - new Date(a.deployed_at).getTime()
       );
@@ -142,6 +154,7 @@ export function useCreateDeploymentMutation() {
     onSuccess: (data, variables) => {
       // Invalidate all deployment queries to refetch fresh data
       queryClient.invalidateQueries({ queryKey: deployments_keys.all });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
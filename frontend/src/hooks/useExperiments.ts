@@ -17,6 +17,7 @@ import {
   type AssignVariantParams,
 } from "@/lib/api/experiments";
 import { experiments_keys } from "@/lib/api/experiments-keys";
+import { kpis_keys } from "@/lib/api/kpis-keys";
 import { useUserId } from "@/hooks/auth/useAuth";
 
 /**
@@ -95,6 +96,7 @@ export function useCreateExperimentMutation() {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: experiments_keys.all });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
@@ -168,6 +170,7 @@ export function useUpdateExperimentMutation() {
     onSettled: () => {
       // Always refetch after mutation to ensure data consistency
       queryClient.invalidateQueries({ queryKey: experiments_keys.all });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
@@ -186,6 +189,7 @@ export function useDeleteExperimentMutation() {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: experiments_keys.all });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
@@ -204,6 +208,7 @@ export function useAssignVariantMutation() {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: experiments_keys.all });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
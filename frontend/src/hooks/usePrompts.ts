@@ -20,6 +20,7 @@ import {
   type ListPromptsParams,
 } from "@/lib/api/prompts";
 import { prompts_keys } from "@/lib/api/prompts-keys";
+import { kpis_keys } from "@/lib/api/kpis-keys";
 import { useUserId } from "@/hooks/auth/useAuth";
 
 /**
@@ -66,7 +67,9 @@ export function useGetMyPromptsQuery(params: ListPromptsParams = {}) {
 /**
  * Fetch a specific prompt by name and optional version
  *
- * If version is not provided, returns the active version
+ * If version is not provided, returns the active version.
+ * A pinned (name, version) row never changes its template, so it stays
+ * fresh until a prompt mutation invalidates `prompts_keys.all`.
  *
  * @param name - The prompt name
  * @param version - Optional specific version number
@@ -84,7 +87,7 @@ export function useGetPromptQuery(name: string, version?: number) {
       return get_active_prompt(name, userId);
     },
     enabled: !!userId,
-    staleTime: 2 * 60 * 1000, // 2 minutes
+    staleTime: version !== undefined ? Infinity : 2 * 60 * 1000, // 2 minutes for the active version
   });
 }
 
@@ -131,6 +134,7 @@ export function useCreatePromptMutation() {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: prompts_keys.all });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
@@ -149,6 +153,7 @@ export function useUpdatePromptMutation() {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: prompts_keys.all });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
@@ -194,6 +199,7 @@ export function useDeletePromptMutation() {
     onSettled: () => {
       // Always refetch after mutation to ensure data consistency
       queryClient.invalidateQueries({ queryKey: prompts_keys.all });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
@@ -218,6 +224,7 @@ export function useRollbackMutation() {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: prompts_keys.all });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
@@ -242,6 +249,7 @@ export function useClonePromptMutation() {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: prompts_keys.all });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
@@ -266,6 +274,7 @@ export function useUpdateVisibilityMutation() {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: prompts_keys.all });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
@@ -3,30 +3,37 @@
 import { useAuth } from "@/hooks/auth/useAuth";
 import type { UserRole } from "@/types/api";
 
-export function useRole() {
-  const { user } = useAuth();
-  const role: UserRole | null = user?.role || null;
-
+function buildPermissions(role: UserRole | null) {
   const isAdmin = role === "admin";
   const isEditor = role === "editor" || isAdmin;
   const isViewer = role === "viewer" || isEditor || isAdmin;
 
-  // Permission helpers
-  const canEdit = isAdmin || role === "editor";
-  const canDelete = isAdmin;
-  const canDeploy = isAdmin || role === "editor";
-  const canManageUsers = isAdmin;
-  const canManageABTests = isAdmin;
-
-  return {
+  return Object.freeze({
     role,
     isAdmin,
     isEditor,
     isViewer,
-    canEdit,
-    canDelete,
-    canDeploy,
-    canManageUsers,
-    canManageABTests,
-  };
+    // Permission helpers
+    canEdit: isAdmin || role === "editor",
+    canDelete: isAdmin,
+    canDeploy: isAdmin || role === "editor",
+    canManageUsers: isAdmin,
+    canManageABTests: isAdmin,
+  });
+}
+
+// One shared permissions object per role, built once at module load, so
+// every component gets the same reference for the same role
+const PERMISSIONS_BY_ROLE: Record<UserRole, ReturnType<typeof buildPermissions>> = {
+  admin: buildPermissions("admin"),
+  editor: buildPermissions("editor"),
+  viewer: buildPermissions("viewer"),
+};
+const NO_PERMISSIONS = buildPermissions(null);
+
+export function useRole() {
+  const { user } = useAuth();
+  const role: UserRole | null = user?.role || null;
+
+  return role ? PERMISSIONS_BY_ROLE[role] : NO_PERMISSIONS;
 }
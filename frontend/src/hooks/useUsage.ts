@@ -6,9 +6,12 @@
 
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import {
-  usageService,
+  get_analytics_by_version,
+  record_usage,
   type RecordUsageParams,
-} from "@/lib/services/usage.service";
+} from "@/lib/api/usage";
+import { usage_keys } from "@/lib/api/usage-keys";
+import { kpis_keys } from "@/lib/api/kpis-keys";
 
 /**
  * Get analytics by version for a prompt
@@ -23,16 +26,18 @@ export function useGetAnalyticsByVersionQuery(
   maxVersion?: number,
 ) {
   return useQuery({
-    queryKey: ["usage", "analytics", promptName, minVersion, maxVersion],
+    queryKey: usage_keys.analytics_by_version(promptName, minVersion, maxVersion),
     queryFn: async () => {
       if (!promptName) return null;
-      return usageService.getAnalyticsByVersion(
+      return get_analytics_by_version(
         promptName,
         minVersion,
         maxVersion,
       );
     },
     enabled: !!promptName,
+    // Dashboards re-read the same ranges; serve them from cache for a minute
+    staleTime: 60 * 1000,
   });
 }
 
@@ -46,11 +51,11 @@ export function useRecordUsageMutation() {
   const queryClient = useQueryClient();
 
   return useMutation({
-    mutationFn: (params: RecordUsageParams) => usageService.record(params),
+    mutationFn: (params: RecordUsageParams) => record_usage(params),
     onSuccess: () => {
       // Invalidate analytics queries to refetch with new data
-      queryClient.invalidateQueries({ queryKey: ["usage", "analytics"] });
-      queryClient.invalidateQueries({ queryKey: ["kpis"] });
+      queryClient.invalidateQueries({ queryKey: usage_keys.analytics() });
+      queryClient.invalidateQueries({ queryKey: kpis_keys.all });
     },
   });
 }
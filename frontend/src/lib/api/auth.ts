@@ -40,7 +40,7 @@ export async function register_user({
 
   // Sign up the user with Supabase Auth
   const { data: authData, error: authError } = await supabase.auth.signUp({
-    email,
+    email: email.trim().toLowerCase(),
     password,
   });
 
@@ -52,6 +52,17 @@ export async function register_user({
     throw new Error('Failed to create user');
   }
 
+  // The handle_new_user trigger already created the profile row with the
+  // default 'editor' role in the signup transaction; no second round-trip needed
+  if (role === 'editor') {
+    return {
+      id: authData.user.id,
+      email: email.trim().toLowerCase(),
+      role,
+      created_at: authData.user.created_at,
+    };
+  }
+
   // Update the user's role in the users table
   type UsersUpdate = Database['public']['Tables']['users']['Update'];
   const updatePayload: UsersUpdate = { role };
@@ -83,7 +94,7 @@ export async function login_with_password({ email, password }: LoginParams): Pro
 
   const { data: authData, error: authError } =
     await supabase.auth.signInWithPassword({
-      email,
+      email: email.trim().toLowerCase(),
       password,
     });
 
@@ -11,8 +11,10 @@ export const deployments_keys = {
     environment: string | null,
     limit?: number,
     offset?: number,
-    prompt_name?: string
-  ) => [...deployments_keys.all, environment, 'history', limit, offset, prompt_name] as const,
+    prompt_name?: string,
+    before?: string
+  ) =>
+    [...deployments_keys.all, environment, 'history', limit, offset, prompt_name, before] as const,
   current: (environment: string | null, prompt_name?: string) =>
     [...deployments_keys.all, environment, 'current', prompt_name] as const,
   all_history: (limit?: number, offset?: number, prompt_name?: string) =>
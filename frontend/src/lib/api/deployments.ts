@@ -10,6 +10,21 @@ import type { Database } from '../supabase/types';
 
 type Deployment = Database['public']['Tables']['deployments']['Row'];
 
+// Deployment lists only show the prompt's name and version, so the embed
+// skips the (potentially large) template and the rest of the prompt row
+const PROMPT_EMBED_COLUMNS = 'id, name, version';
+const USER_EMBED = 'user:users!deployments_deployed_by_fkey(id,email,role)';
+const DEPLOYMENT_SELECT = `*, prompt:prompts(${PROMPT_EMBED_COLUMNS}), ${USER_EMBED}`;
+
+// Prompt ids by (user, name, version). A version's id only changes if the
+// prompt is deleted and recreated under the same name; the insert then fails
+// its foreign key and create_deployment looks the id up again
+const prompt_id_cache = new Map<string, number>();
+const PROMPT_ID_CACHE_MAX_ENTRIES = 256;
+
+// Postgres foreign_key_violation
+const FOREIGN_KEY_VIOLATION = '23503';
+
 export interface CreateDeploymentParams {
   prompt_name: string;
   version: number;
@@ -17,21 +32,19 @@ export interface CreateDeploymentParams {
 }
 
 /**
- * Create a new deployment
+ * Find the prompt id for a name and version, and remember it
  */
-export async function create_deployment(
-  user_id: string,
-  params: CreateDeploymentParams
-) {
+async function lookup_prompt_id(
+  cache_key: string,
+  prompt_name: string,
+  version: number
+): Promise<number> {
   const supabase = createClient();
 
-  const { prompt_name, version, environment } = params;
-
-  // Find the prompt by name and version
   const { data: prompt, error: prompt_error } = await (
     supabase.from('prompts') as any
   )
-    .select('*')
+    .select('id')
     .eq('name', prompt_name)
     .eq('version', version)
     .single();
@@ -40,21 +53,53 @@ export async function create_deployment(
     throw new Error('Prompt not found');
   }
 
+  const prompt_id = prompt.id as number;
+  if (prompt_id_cache.size >= PROMPT_ID_CACHE_MAX_ENTRIES) {
+    prompt_id_cache.delete(prompt_id_cache.keys().next().value!);
+  }
+  prompt_id_cache.set(cache_key, prompt_id);
+  return prompt_id;
+}
+
+/**
+ * Create a new deployment
+ */
+export async function create_deployment(
+  user_id: string,
+  params: CreateDeploymentParams
+) {
+  const supabase = createClient();
+
+  const { prompt_name, version, environment } = params;
+
+  // Find the prompt by name and version (redeploys skip the lookup)
+  const cache_key = `${user_id}:${prompt_name}:${version}`;
+  const cached_id = prompt_id_cache.get(cache_key);
+  const prompt_id =
+    cached_id ?? (await lookup_prompt_id(cache_key, prompt_name, version));
+
+  const insert_deployment = (id: number) =>
+    (supabase.from('deployments') as any)
+      .insert({
+        prompt_id: id,
+        environment,
+        deployed_by: user_id,
+      })
+      .select(DEPLOYMENT_SELECT)
+      .single();
+
   // Create the deployment
-  const { data, error } = await (supabase.from('deployments') as any)
-    .insert({
-      prompt_id: prompt.id,
-      environment,
-      deployed_by: user_id,
-    })
-    .select(`
-      *,
-      prompt:prompts(*),
-      user:users!deployments_deployed_by_fkey(id,email,role)
-    `)
-    .single();
+  let { data, error } = await insert_deployment(prompt_id);
+
+  // A cached id can outlive its prompt; look it up again and retry once
+  if (error?.code === FOREIGN_KEY_VIOLATION && cached_id !== undefined) {
+    prompt_id_cache.delete(cache_key);
+    const fresh_id = await lookup_prompt_id(cache_key, prompt_name, version);
+    ({ data, error } = await insert_deployment(fresh_id));
+  }
 
   if (error) {
+    prompt_id_cache.delete(cache_key);
     throw new Error(error.message);
   }
 
@@ -71,69 +116,124 @@ export async function get_current_deployment(
 ) {
   const supabase = createClient();
 
+  // Filter by prompt name through an inner embed, so the latest deployment
+  // of that prompt is found even when another prompt was deployed since
+  const select = prompt_name
+    ? `*, prompt:prompts!inner(${PROMPT_EMBED_COLUMNS}), ${USER_EMBED}`
+    : DEPLOYMENT_SELECT;
+
   let query = (supabase.from('deployments') as any)
-    .select(`
-      *,
-      prompt:prompts(*),
-      user:users!deployments_deployed_by_fkey(id,email,role)
-    `)
-    .eq('environment', environment)
-    .order('deployed_at', { ascending: false })
-    .limit(1);
+    .select(select)
+    .eq('environment', environment);
 
   if (prompt_name) {
-    // We need to join with prompts to filter by name
-    // Since we can't do this directly in the query, we'll filter client-side
-    const { data, error } = await query;
-    if (error) {
-      throw new Error(error.message);
-    }
-
-    const filtered = (data as any[])?.filter((d: any) => d.prompt?.name === prompt_name);
-    return filtered && filtered.length > 0 ? filtered[0] : null;
+    query = query.eq('prompt.name', prompt_name);
   }
 
-  const { data, error } = await query.single();
+  query = query.order('deployed_at', { ascending: false }).limit(1);
+
+  const { data, error } = await query.maybeSingle();
 
-  if (error && error.code !== 'PGRST116') {
+  if (error) {
     throw new Error(error.message);
   }
 
-  return data || null;
+  return data;
+}
+
+/**
+ * Keyset cursor for deployment history: the (deployed_at, id) of the last
+ * row on a page, encoded so callers treat it as opaque
+ */
+function encode_history_cursor(row: { deployed_at: string; id: number }): string {
+  return btoa(JSON.stringify([row.deployed_at, row.id]));
+}
+
+function decode_history_cursor(cursor: string): [string, number] {
+  const [deployed_at, id] = JSON.parse(atob(cursor));
+  return [deployed_at, id];
 }
 
 /**
  * Get deployment history for an environment
+ *
+ * Pass the previous page's `next_cursor` as `before` to page by keyset,
+ * which costs the same at any depth; `offset` still works for jumping to a
+ * page directly.
+ *
+ * `has_next` comes from a probe for the first row of the next page that
+ * selects only the id, instead of over-fetching a full deployment row.
  */
 export async function get_history(
   environment: string,
   user_id: string,
-  params: { limit?: number; offset?: number; promptName?: string } = {}
+  params: {
+    limit?: number;
+    offset?: number;
+    promptName?: string;
+    before?: string;
+  } = {}
 ) {
   const supabase = createClient();
 
-  const { limit = 20, offset = 0, promptName } = params;
+  const { limit = 20, promptName, before } = params;
+  const offset = before ? 0 : params.offset ?? 0;
 
-  const { data, error } = await (supabase.from('deployments') as any)
-    .select(`
-      *,
-      prompt:prompts(*),
-      user:users!deployments_deployed_by_fkey(id,email,role)
-    `)
-    .eq('environment', environment)
-    .order('deployed_at', { ascending: false })
-    .range(offset, offset + limit);
+  // Filter by prompt name in the database (inner join) so pagination sees
+  // the same rows the caller does
+  const prompt_embed = promptName ? 'prompt:prompts!inner' : 'prompt:prompts';
 
-  if (error) {
-    throw new Error(error.message);
-  }
+  let page_query = (supabase.from('deployments') as any)
+    .select(`*, ${prompt_embed}(${PROMPT_EMBED_COLUMNS}), ${USER_EMBED}`)
+    .eq('environment', environment);
 
-  let items = (data || []) as any[];
+  let next_query = (supabase.from('deployments') as any)
+    .select(promptName ? 'id, prompt:prompts!inner(name)' : 'id')
+    .eq('environment', environment);
 
-  // Filter by prompt name if specified (client-side)
   if (promptName) {
-    items = items.filter((d: any) => d.prompt?.name === promptName);
+    page_query = page_query.eq('prompt.name', promptName);
+    next_query = next_query.eq('prompt.name', promptName);
+  }
+
+  if (before) {
+    // Rows strictly after the cursor in (deployed_at DESC, id DESC) order
+    const [deployed_at, id] = decode_history_cursor(before);
+    const keyset = `deployed_at.lt."${deployed_at}",and(deployed_at.eq."${deployed_at}",id.lt.${id})`;
+    page_query = page_query.or(keyset);
+    next_query = next_query.or(keyset);
+  }
+
+  const [
+    { data, error },
+    { data: next_rows, error: next_error },
+  ] = await Promise.all([
+    page_query
+      .order('deployed_at', { ascending: false })
+      .order('id', { ascending: false })
+      .range(offset, offset + limit - 1),
+    next_query
+      .order('deployed_at', { ascending: false })
+      .order('id', { ascending: false })
+      .range(offset + limit, offset + limit),
+  ]);
+
+  if (error) {
+    throw new Error(error.message);
+  }
+  if (next_error) {
+    throw new Error(next_error.message);
   }
 
-  return items;
+  const items = (data || []) as any[];
+  const has_next = (next_rows?.length ?? 0) > 0;
+
+  return {
+    items,
+    has_next,
+    next_cursor:
+      has_next && items.length > 0
+        ? encode_history_cursor(items[items.length - 1])
+        : null,
+  };
 }
@@ -9,7 +9,6 @@ import { createClient } from '@/utils/supabase/client';
 import type { Database } from '../supabase/types';
 
 type ABPolicy = Database['public']['Tables']['ab_policies']['Row'];
-type ABAssignment = Database['public']['Tables']['ab_assignments']['Row'];
 
 export interface SetPolicyParams {
   prompt_name: string;
@@ -23,6 +22,62 @@ export interface AssignVariantParams {
   user_id: string;
 }
 
+interface WeightTable {
+  versions: number[];
+  thresholds: number[]; // cumulative weights, ascending
+  total: number;
+}
+
+// Cumulative weight tables per policy revision; a policy's weights only
+// change with updated_at, so the table is built once per revision
+const weight_tables = new Map<string, WeightTable>();
+const WEIGHT_TABLES_MAX_ENTRIES = 256;
+
+function get_weight_table(policy: ABPolicy): WeightTable {
+  const key = `${policy.id}:${policy.updated_at}`;
+  const cached = weight_tables.get(key);
+  if (cached) {
+    return cached;
+  }
+
+  const versions: number[] = [];
+  const thresholds: number[] = [];
+  let total = 0;
+  for (const [version, weight] of Object.entries(
+    policy.weights as Record<string, number>
+  )) {
+    total += weight;
+    versions.push(Number(version));
+    thresholds.push(total);
+  }
+
+  if (weight_tables.size >= WEIGHT_TABLES_MAX_ENTRIES) {
+    weight_tables.delete(weight_tables.keys().next().value!);
+  }
+  const table = { versions, thresholds, total };
+  weight_tables.set(key, table);
+  return table;
+}
+
+/**
+ * Pick a version with probability proportional to its weight
+ * (binary search over the cumulative thresholds)
+ */
+function choose_version({ versions, thresholds, total }: WeightTable): number {
+  const target = Math.random() * total;
+  let low = 0;
+  let high = thresholds.length - 1;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (thresholds[mid] < target) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  return versions[low];
+}
+
 /**
  * Create or update an A/B testing policy
  */
@@ -34,53 +89,42 @@ export async function set_policy(
 
   const { prompt_name, weights, is_public = false } = params;
 
-  // Validate weights (should sum to ~1.0 or 100)
-  const total_weight = Object.values(weights).reduce((sum, w) => sum + w, 0);
+  // Validate weights in one pass: integer version keys, positive weights,
+  // and a total of ~1.0 or 100
+  let total_weight = 0;
+  for (const [version, weight] of Object.entries(weights)) {
+    if (!Number.isInteger(Number(version))) {
+      throw new Error(`Invalid version: ${version}`);
+    }
+    if (!(weight > 0) || !Number.isFinite(weight)) {
+      throw new Error('Weights must be positive');
+    }
+    total_weight += weight;
+  }
   if (Math.abs(total_weight - 1.0) > 0.01 && Math.abs(total_weight - 100) > 1) {
     throw new Error('Weights must sum to 1.0 or 100');
   }
 
-  // Check if policy already exists
-  const { data: existing } = await (supabase.from('ab_policies') as any)
-    .select('*')
-    .eq('prompt_name', prompt_name)
-    .eq('created_by', user_id)
-    .single();
-
-  if (existing) {
-    // Update existing policy
-    const { data, error } = await (supabase.from('ab_policies') as any)
-      .update({
-        weights: weights as any,
-        is_public,
-      })
-      .eq('id', existing.id)
-      .select()
-      .single();
-
-    if (error) {
-      throw new Error(error.message);
-    }
-
-    return data;
-  } else {
-    // Create new policy
-    const { data, error } = await (supabase.from('ab_policies') as any)
-      .insert({
+  // Insert or update in one statement; uq_ab_policies_prompt_name_user
+  // decides which, so there is no separate existence check to race with
+  const { data, error } = await (supabase.from('ab_policies') as any)
+    .upsert(
+      {
         prompt_name,
         weights: weights as any,
         created_by: user_id,
         is_public,
-      })
-      .select()
-      .single();
-
-    if (error) {
-      throw new Error(error.message);
-    }
+      },
+      { onConflict: 'prompt_name,created_by' }
+    )
+    .select()
+    .single();
 
-    return data;
+  if (error) {
+    throw new Error(error.message);
   }
+
+  return data;
 }
 
 /**
@@ -169,57 +213,65 @@ export async function assign(
 
   const { experiment_name, prompt_name, user_id } = params;
 
-  // Check if assignment already exists
-  const { data: existing } = await (supabase.from('ab_assignments') as any)
-    .select('*')
-    .eq('experiment_name', experiment_name)
-    .eq('prompt_name', prompt_name)
-    .eq('user_id', user_id)
-    .single();
+  const find_existing = () =>
+    (supabase.from('ab_assignments') as any)
+      .select('version')
+      .eq('experiment_name', experiment_name)
+      .eq('prompt_name', prompt_name)
+      .eq('user_id', user_id)
+      .maybeSingle();
+
+  // Look up an existing assignment and the policy concurrently
+  const [{ data: existing }, policy] = await Promise.all([
+    find_existing(),
+    get_policy_by_name(prompt_name, current_user_id),
+  ]);
 
   if (existing) {
     return existing.version;
   }
 
-  // Get the policy
-  const policy = await get_policy_by_name(prompt_name, current_user_id);
   if (!policy) {
     throw new Error('Policy not found');
   }
 
   // Randomly assign a version based on weights
-  const weights = policy.weights as Record<string, number>;
-  const versions = Object.keys(weights).map(Number);
-  const weight_values = Object.values(weights);
-
-  const total_weight = weight_values.reduce((sum, w) => sum + w, 0);
-  let random = Math.random() * total_weight;
-
-  let selected_version = versions[0];
-  for (let i = 0; i < versions.length; i++) {
-    random -= weight_values[i];
-    if (random <= 0) {
-      selected_version = versions[i];
-      break;
-    }
-  }
+  const selected_version = choose_version(get_weight_table(policy));
 
-  // Create the assignment
+  // Create the assignment; ON CONFLICT DO NOTHING (uq_assignment_unique)
+  // makes concurrent first assignments for the same user race-free
   const { data, error } = await (supabase.from('ab_assignments') as any)
-    .insert({
-      experiment_name,
-      prompt_name,
-      user_id,
-      version: selected_version,
-    })
-    .select()
-    .single();
+    .upsert(
+      {
+        experiment_name,
+        prompt_name,
+        user_id,
+        version: selected_version,
+      },
+      {
+        onConflict: 'experiment_name,prompt_name,user_id',
+        ignoreDuplicates: true,
+      }
+    )
+    .select('version')
+    .maybeSingle();
 
   if (error) {
     throw new Error(error.message);
   }
 
-  return data.version;
+  if (data) {
+    return data.version;
+  }
+
+  // Another request assigned this user first; return its version
+  const { data: winner, error: winner_error } = await find_existing();
+
+  if (winner_error || !winner) {
+    throw new Error(winner_error?.message || 'Failed to assign variant');
+  }
+
+  return winner.version;
 }
 
 /**
@@ -231,27 +283,21 @@ export async function get_experiment_stats(
 ) {
   const supabase = createClient();
 
-  // Get all assignments for this experiment
-  const { data: assignments, error: assignments_error } = await (
-    supabase.from('ab_assignments') as any
-  )
-    .select('*')
-    .eq('experiment_name', experiment_name);
+  // Counted per version in Postgres (see ab_experiment_stats)
+  const { data: rows, error } = await supabase.rpc('ab_experiment_stats', {
+    experiment: experiment_name,
+  });
 
-  if (assignments_error) {
-    throw new Error(assignments_error.message);
+  if (error) {
+    throw new Error(error.message);
   }
 
-  // Group by version and count
-  const version_counts = (assignments || []).reduce(
-    (acc: Record<number, number>, a: ABAssignment) => {
-      acc[a.version] = (acc[a.version] || 0) + 1;
-      return acc;
-    },
-    {} as Record<number, number>
-  );
-
-  const total_assignments = assignments?.length || 0;
+  const version_counts: Record<number, number> = {};
+  let total_assignments = 0;
+  for (const row of rows || []) {
+    version_counts[row.version] = row.assignments;
+    total_assignments += row.assignments;
+  }
 
   return {
     experiment_name,
@@ -10,6 +10,10 @@ import type { Database } from '../supabase/types';
 
 type Prompt = Database['public']['Tables']['prompts']['Row'];
 
+// Columns list_prompts may sort by; built once and checked at the boundary
+// so an arbitrary column name never reaches PostgREST
+const PROMPT_SORT_COLUMNS: ReadonlySet<string> = new Set(['created_at', 'version', 'name']);
+
 export interface CreatePromptParams {
   name: string;
   template: string;
@@ -34,6 +38,9 @@ export interface ListPromptsParams {
   offset?: number;
   visibility?: 'all' | 'public' | 'private' | 'owned';
   owned?: boolean;
+  // Set to false when the caller doesn't show a total, to skip the COUNT;
+  // count is then null
+  with_count?: boolean;
 }
 
 /**
@@ -56,13 +63,19 @@ export async function list_prompts(
     offset = 0,
     visibility = 'all',
     owned = false,
+    with_count = true,
   } = params;
 
+  if (!PROMPT_SORT_COLUMNS.has(sort_by)) {
+    throw new Error(`Invalid sort_by: ${sort_by}`);
+  }
+
   let query = supabase
     .from('prompts')
-    .select('*, author:users!prompts_created_by_fkey(id, email, role)', {
-      count: 'exact',
-    });
+    .select(
+      '*, author:users!prompts_created_by_fkey(id, email, role)',
+      with_count ? { count: 'exact' } : undefined
+    );
 
   // Apply visibility filter
   if (visibility === 'public') {
@@ -90,8 +103,9 @@ export async function list_prompts(
   // Apply sorting
   query = query.order(sort_by, { ascending: order === 'asc' });
 
-  // Apply pagination
-  query = query.range(offset, offset + limit - 1);
+  // Apply pagination; without a count, fetch one extra row to tell whether
+  // there is a next page
+  query = query.range(offset, offset + limit - (with_count ? 1 : 0));
 
   const { data, error, count } = await query;
 
@@ -99,8 +113,13 @@ export async function list_prompts(
     throw new Error(error.message);
   }
 
-  // If latest_only, filter to get only the latest version of each prompt
   let items = (data || []) as any[];
+  const has_more = !with_count && items.length > limit;
+  if (has_more) {
+    items = items.slice(0, limit);
+  }
+
+  // If latest_only, filter to get only the latest version of each prompt
   if (latest_only && items.length > 0) {
     const latest_versions = new Map<string, any>();
     for (const item of items) {
@@ -112,8 +131,9 @@ export async function list_prompts(
     items = Array.from(latest_versions.values());
   }
 
-  const total = count || 0;
-  const has_next = offset + limit < total;
+  // Without a COUNT there is no total to report; callers page on has_next
+  const total = with_count ? count || 0 : null;
+  const has_next = total !== null ? offset + limit < total : has_more;
 
   return {
     items,
@@ -135,34 +155,14 @@ export async function create_prompt(
 
   const { name, template, variables = [], is_public = false } = params;
 
-  // Get the next version number for this prompt name
-  const { data: existing_prompts } = await supabase
-    .from('prompts')
-    .select('version')
-    .eq('name', name)
-    .order('version', { ascending: false })
-    .limit(1);
-
-  const next_version =
-    existing_prompts && (existing_prompts as any[]).length > 0
-      ? (existing_prompts as any[])[0].version + 1
-      : 1;
-
-  // Deactivate all previous versions
-  if (next_version > 1) {
-    await (supabase.from('prompts') as any).update({ active: false }).eq('name', name);
-  }
-
-  // Create the new prompt
-  const { data, error } = await (supabase.from('prompts') as any)
-    .insert({
-      name,
-      template,
-      variables: variables as any,
-      version: next_version,
-      created_by: user_id,
-      active: true,
-      is_public,
+  // Numbering, deactivating the previous version and inserting happen in
+  // one call (see create_prompt_version)
+  const { data, error } = await supabase
+    .rpc('create_prompt_version', {
+      prompt_name: name,
+      prompt_template: template,
+      prompt_variables: variables as any,
+      make_public: is_public,
     })
     .select('*, author:users!prompts_created_by_fkey(id, email, role)')
     .single();
@@ -189,13 +189,13 @@ export async function get_active_prompt(
     .eq('name', name)
     .eq('active', true)
     .or(`is_public.eq.true,created_by.eq.${user_id}`)
-    .single();
+    .maybeSingle();
 
-  if (error && error.code !== 'PGRST116') {
+  if (error) {
     throw new Error(error.message);
   }
 
-  return data || null;
+  return data;
 }
 
 /**
@@ -214,13 +214,13 @@ export async function get_version(
     .eq('name', name)
     .eq('version', version)
     .or(`is_public.eq.true,created_by.eq.${user_id}`)
-    .single();
+    .maybeSingle();
 
-  if (error && error.code !== 'PGRST116') {
+  if (error) {
     throw new Error(error.message);
   }
 
-  return data || null;
+  return data;
 }
 
 /**
@@ -351,7 +351,8 @@ export async function delete_prompt(name: string): Promise<number> {
     .from('prompts')
     .delete()
     .eq('name', name)
-    .select();
+    // Only the count is needed; don't ship every deleted template back
+    .select('id');
 
   if (error) {
     throw new Error(error.message);
@@ -370,10 +371,10 @@ export async function set_visibility(
 ): Promise<Prompt> {
   const supabase = createClient();
 
-  // Check ownership
+  // Check ownership (existence only, no need to load the template)
   const { data: prompts } = await supabase
     .from('prompts')
-    .select('*')
+    .select('id')
     .eq('name', name)
     .eq('created_by', user_id)
     .limit(1);
@@ -442,7 +443,8 @@ export async function get_diff(
   const from_lines = from.template.split('\n');
   const to_lines = to.template.split('\n');
 
-  let diff = '';
+  // Collect lines and join once instead of re-concatenating the whole diff per line
+  const diff: string[] = [];
   const max_lines = Math.max(from_lines.length, to_lines.length);
 
   for (let i = 0; i < max_lines; i++) {
@@ -450,12 +452,12 @@ export async function get_diff(
     const to_line = to_lines[i] || '';
 
     if (from_line !== to_line) {
-      if (from_line) diff += `- ${from_line}\n`;
-      if (to_line) diff += `+ ${to_line}\n`;
+      if (from_line) diff.push(`- ${from_line}`);
+      if (to_line) diff.push(`+ ${to_line}`);
     } else {
-      diff += `  ${from_line}\n`;
+      diff.push(`  ${from_line}`);
     }
   }
 
-  return diff;
+  return diff.length > 0 ? diff.join('\n') + '\n' : '';
 }
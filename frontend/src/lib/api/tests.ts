@@ -12,6 +12,10 @@ type TestCase = Database['public']['Tables']['test_cases']['Row'];
 type TestRun = Database['public']['Tables']['test_runs']['Row'];
 type TestCategory = Database['public']['Enums']['test_category'];
 
+// Ownership checks on a test case only need its prompt's owner, not the
+// whole prompt row (template included)
+const OWNER_CHECK_SELECT = 'id, prompt:prompts(created_by)';
+
 export interface CreateTestCaseParams {
   name: string;
   input_text: string;
@@ -55,25 +59,28 @@ export async function get_test_suite(prompt_name: string, user_id: string) {
     throw new Error('You do not have permission to view this prompt');
   }
 
-  // Get test cases
-  const { data: test_cases, error: cases_error } = await supabase
-    .from('test_cases')
-    .select('*')
-    .eq('prompt_id', (prompt as any).id)
-    .order('created_at', { ascending: false });
+  // Get test cases and recent test runs concurrently
+  const [
+    { data: test_cases, error: cases_error },
+    { data: test_runs, error: runs_error },
+  ] = await Promise.all([
+    supabase
+      .from('test_cases')
+      .select('*')
+      .eq('prompt_id', (prompt as any).id)
+      .order('created_at', { ascending: false }),
+    supabase
+      .from('test_runs')
+      .select('*')
+      .eq('prompt_id', (prompt as any).id)
+      .order('executed_at', { ascending: false })
+      .limit(50),
+  ]);
 
   if (cases_error) {
     throw new Error(cases_error.message);
   }
 
-  // Get recent test runs
-  const { data: test_runs, error: runs_error } = await supabase
-    .from('test_runs')
-    .select('*')
-    .eq('prompt_id', (prompt as any).id)
-    .order('executed_at', { ascending: false })
-    .limit(50);
-
   if (runs_error) {
     throw new Error(runs_error.message);
   }
@@ -148,7 +155,7 @@ export async function update_test_case(
   // Get the test case
   const { data: test_case, error: get_case_error } = await supabase
     .from('test_cases')
-    .select('*, prompt:prompts(*)')
+    .select(OWNER_CHECK_SELECT)
     .eq('id', case_id)
     .single();
 
@@ -187,7 +194,7 @@ export async function delete_test_case(
   // Get the test case
   const { data: test_case, error: get_case_error } = await supabase
     .from('test_cases')
-    .select('*, prompt:prompts(*)')
+    .select(OWNER_CHECK_SELECT)
     .eq('id', case_id)
     .single();
 
@@ -0,0 +1,17 @@
+/**
+ * Usage Query Keys Factory
+ *
+ * Centralized query keys for usage-related queries.
+ * Follows TanStack Query best practices for key management.
+ */
+
+export const usage_keys = {
+  all: ['usage'] as const,
+  analytics: () => [...usage_keys.all, 'analytics'] as const,
+  analytics_by_version: (
+    prompt_name: string | null,
+    min_version?: number,
+    max_version?: number
+  ) =>
+    [...usage_keys.analytics(), prompt_name, min_version, max_version] as const,
+} as const;
@@ -0,0 +1,82 @@
+/**
+ * Usage API Functions
+ *
+ * Functional API for usage tracking and analytics.
+ * Designed for use with TanStack Query.
+ */
+
+import { createClient } from '@/utils/supabase/client';
+import type { Database } from '../supabase/types';
+
+type UsageEvent = Database['public']['Tables']['usage_events']['Row'];
+
+// Recording is a write-heavy path; echo back only what identifies the event
+// rather than the full row (which includes the model output)
+const RECORDED_USAGE_COLUMNS = 'id, prompt_id, created_at, success';
+
+export type RecordedUsage = Pick<
+  UsageEvent,
+  'id' | 'prompt_id' | 'created_at' | 'success'
+>;
+
+export interface RecordUsageParams {
+  prompt_id: number;
+  user_id?: string | null;
+  output?: string | null;
+  success?: boolean;
+  latency_ms?: number | null;
+  cost?: number | null;
+}
+
+/**
+ * Record a usage event
+ */
+export async function record_usage(
+  params: RecordUsageParams
+): Promise<RecordedUsage> {
+  const supabase = createClient();
+
+  const { data, error } = await (supabase.from('usage_events') as any)
+    .insert({
+      prompt_id: params.prompt_id,
+      user_id: params.user_id || null,
+      output: params.output || null,
+      success: params.success ?? true,
+      latency_ms: params.latency_ms || null,
+      cost: params.cost || null,
+    })
+    .select(RECORDED_USAGE_COLUMNS)
+    .single();
+
+  if (error) {
+    throw new Error(error.message);
+  }
+
+  return data;
+}
+
+/**
+ * Get analytics by version for a prompt
+ *
+ * Aggregated per version by the `usage_by_version` SQL function, so only
+ * one row per version leaves the database.
+ */
+export async function get_analytics_by_version(
+  prompt_name: string,
+  min_version?: number,
+  max_version?: number
+) {
+  const supabase = createClient();
+
+  const { data, error } = await supabase.rpc('usage_by_version', {
+    prompt: prompt_name,
+    min_version,
+    max_version,
+  });
+
+  if (error) {
+    throw new Error(error.message);
+  }
+
+  return data || [];
+}
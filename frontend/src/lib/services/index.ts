@@ -1,13 +0,0 @@
-/**
- * Services Index
- *
- * Exports all Supabase-based services
- */
-
-export * from "./prompts.service";
-export * from "./deployments.service";
-export * from "./ab.service";
-export * from "./usage.service";
-export * from "./kpis.service";
-export * from "./tests.service";
-export * from "./ai.service";
@@ -335,7 +335,91 @@ export type Database = {
       [_ in never]: never;
     };
     Functions: {
-      [_ in never]: never;
+      ab_experiment_stats: {
+        Args: {
+          experiment: string;
+        };
+        Returns: {
+          version: number;
+          assignments: number;
+        }[];
+      };
+      usage_by_version: {
+        Args: {
+          prompt: string;
+          min_version?: number;
+          max_version?: number;
+        };
+        Returns: {
+          version: number;
+          count: number;
+          success_rate: number;
+          avg_cost: number | null;
+        }[];
+      };
+      kpi_experiment_arms: {
+        Args: Record<PropertyKey, never>;
+        Returns: {
+          prompt_name: string;
+          version: number;
+          assignments: number;
+          success_rate: number | null;
+        }[];
+      };
+      create_prompt_version: {
+        Args: {
+          prompt_name: string;
+          prompt_template: string;
+          prompt_variables?: Json;
+          make_public?: boolean;
+        };
+        Returns: Database["public"]["Tables"]["prompts"]["Row"][];
+      };
+      kpi_summary: {
+        Args: Record<PropertyKey, never>;
+        Returns: {
+          total_prompts: number;
+          active_prompts: number;
+          total_deployments: number;
+          running_experiments: number;
+          recent_usage: number;
+        }[];
+      };
+      kpi_usage_trend: {
+        Args: {
+          period_days?: number;
+          bucket?: string;
+        };
+        Returns: {
+          period: string;
+          executions: number;
+          failures: number;
+          avg_latency: number | null;
+          avg_cost: number | null;
+        }[];
+      };
+      kpi_version_velocity: {
+        Args: {
+          months?: number;
+        };
+        Returns: {
+          month: string;
+          releases: number;
+        }[];
+      };
+      kpi_top_prompts: {
+        Args: {
+          max_results?: number;
+          period_days?: number;
+        };
+        Returns: {
+          name: string;
+          executions: number;
+          success_rate: number;
+          avg_cost: number | null;
+          last_updated: string;
+        }[];
+      };
     };
     Enums: {
       user_role: "admin" | "editor" | "viewer";
@@ -9,6 +9,10 @@ import { createServerClient } from '@supabase/ssr';
 import { NextResponse, type NextRequest } from 'next/server';
 import type { Database } from '@/lib/supabase/types';
 
+// Route rules are fixed, so build them once instead of on every request
+const PROTECTED_PREFIXES = ['/prompts', '/experiments', '/deployments', '/ai-generator'];
+const AUTH_ROUTES = new Set(['/login', '/register']);
+
 export async function updateSession(request: NextRequest) {
   let supabaseResponse = NextResponse.next({
     request,
@@ -45,18 +49,14 @@ export async function updateSession(request: NextRequest) {
     data: { user },
   } = await supabase.auth.getUser();
 
+  const { pathname } = request.nextUrl;
+
   // Protected routes - require authentication
   const isProtectedRoute =
-    request.nextUrl.pathname.startsWith('/prompts') ||
-    request.nextUrl.pathname.startsWith('/experiments') ||
-    request.nextUrl.pathname.startsWith('/deployments') ||
-    request.nextUrl.pathname.startsWith('/ai-generator') ||
-    request.nextUrl.pathname === '/';
+    pathname === '/' || PROTECTED_PREFIXES.some((prefix) => pathname.startsWith(prefix));
 
   // Auth routes - redirect to home if already authenticated
-  const isAuthRoute =
-    request.nextUrl.pathname === '/login' ||
-    request.nextUrl.pathname === '/register';
+  const isAuthRoute = AUTH_ROUTES.has(pathname);
 
   // Redirect to login if accessing protected route without auth
   if (isProtectedRoute && !user) {
@@ -7,13 +7,106 @@ Usage:
     c.create_prompt(name="welcome", template="Hello {{name}}", variables=["name"]) 
 """
 from typing import Any, Dict, List, Optional
+import gzip
+import importlib.util
+import json
+import logging
+import queue
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # optional, only needed for AsyncClient
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+try:  # optional, faster JSON encoding/decoding
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# optional, enables HTTP/2 in AsyncClient
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+logger = logging.getLogger(__name__)
+
+def _dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+
+def _loads(content: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+# Request bodies smaller than this aren't worth compressing
+_COMPRESS_MIN_BYTES = 1024
+
+
+def _encode_json(payload: Any, headers: Dict[str, str], compress: bool) -> bytes:
+    # Gzip large bodies when the client opted in; the server must accept
+    # Content-Encoding: gzip on requests. Responses are already negotiated
+    # by requests/httpx (Accept-Encoding: gzip, plus br when brotli is installed).
+    body = _dumps(payload)
+    if compress and len(body) > _COMPRESS_MIN_BYTES:
+        body = gzip.compress(body)
+        headers["Content-Encoding"] = "gzip"
+    return body
+
+
+def _make_session() -> requests.Session:
+    # Retries only apply to reads: update_prompt's PUT creates a new version, so
+    # replaying it could duplicate one. Once retries run out the last response is
+    # returned, so raise_for_status() still raises HTTPError as before.
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 
 class Client:
-    def __init__(self, base_url: str, token: Optional[str] = None):
+    def __init__(self, base_url: str, token: Optional[str] = None, compress_requests: bool = False):
         self.base_url = base_url.rstrip('/')
         self.token = token
+        self.compress_requests = compress_requests
+        # One pooled session per client, so calls reuse keep-alive connections
+        # instead of a new TCP/TLS handshake each time
+        self._session = _make_session()
+        self._usage_queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=10000)
+        self._usage_thread: Optional[threading.Thread] = None
+        self._usage_lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._usage_lock:
+            if self._usage_thread is not None:
+                self._usage_queue.put(None)
+                self._usage_thread.join()
+                self._usage_thread = None
+        self._session.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def _headers(self) -> Dict[str, str]:
         headers = {"Content-Type": "application/json"}
@@ -21,55 +114,192 @@ class Client:
             headers["Authorization"] = f"Bearer {self.token}"
         return headers
 
+    def _json_body(self, payload: Any, auth: bool = True) -> Dict[str, Any]:
+        headers = self._headers() if auth else {"Content-Type": "application/json"}
+        return {"data": _encode_json(payload, headers, self.compress_requests), "headers": headers}
+
     def login(self, email: str, password: str) -> str:
-        r = requests.post(f"{self.base_url}/auth/login", data={"username": email, "password": password})
+        r = self._session.post(f"{self.base_url}/auth/login", data={"username": email, "password": password})
         r.raise_for_status()
-        tok = r.json()["access_token"]
+        tok = _loads(r.content)["access_token"]
         self.token = tok
         return tok
 
     def create_prompt(self, name: str, template: str, variables: List[str]):
-        r = requests.post(f"{self.base_url}/prompts/", json={"name": name, "template": template, "variables": variables}, headers=self._headers())
+        r = self._session.post(f"{self.base_url}/prompts/", **self._json_body({"name": name, "template": template, "variables": variables}))
         r.raise_for_status()
-        return r.json()
+        return _loads(r.content)
 
     def update_prompt(self, name: str, template: str, variables: List[str]):
-        r = requests.put(f"{self.base_url}/prompts/{name}", json={"template": template, "variables": variables}, headers=self._headers())
+        r = self._session.put(f"{self.base_url}/prompts/{name}", **self._json_body({"template": template, "variables": variables}))
         r.raise_for_status()
-        return r.json()
+        return _loads(r.content)
 
     def list_versions(self, name: str):
-        r = requests.get(f"{self.base_url}/prompts/{name}/versions", headers=self._headers())
+        r = self._session.get(f"{self.base_url}/prompts/{name}/versions", headers=self._headers())
         r.raise_for_status()
-        return r.json()
+        return _loads(r.content)
 
     def get_version(self, name: str, version: int):
-        r = requests.get(f"{self.base_url}/prompts/{name}/versions/{version}", headers=self._headers())
+        r = self._session.get(f"{self.base_url}/prompts/{name}/versions/{version}", headers=self._headers())
         r.raise_for_status()
-        return r.json()
+        return _loads(r.content)
 
     def rollback(self, name: str, version: int):
-        r = requests.post(f"{self.base_url}/prompts/{name}/rollback/{version}", headers=self._headers())
+        r = self._session.post(f"{self.base_url}/prompts/{name}/rollback/{version}", headers=self._headers())
         r.raise_for_status()
-        return r.json()
+        return _loads(r.content)
 
     def diff(self, name: str, from_version: int, to_version: int):
-        r = requests.get(f"{self.base_url}/prompts/{name}/diff", params={"from": from_version, "to": to_version}, headers=self._headers())
+        r = self._session.get(f"{self.base_url}/prompts/{name}/diff", params={"from": from_version, "to": to_version}, headers=self._headers())
         r.raise_for_status()
-        return r.json()
+        return _loads(r.content)
 
     def deploy(self, prompt_name: str, version: int, environment: str):
-        r = requests.post(f"{self.base_url}/deployments/", json={"prompt_name": prompt_name, "version": version, "environment": environment}, headers=self._headers())
+        r = self._session.post(f"{self.base_url}/deployments/", **self._json_body({"prompt_name": prompt_name, "version": version, "environment": environment}))
         r.raise_for_status()
-        return r.json()
+        return _loads(r.content)
 
     def assign_variant(self, experiment: str, prompt_name: str, user_id: str):
-        r = requests.post(f"{self.base_url}/ab/assign", json={"experiment_name": experiment, "prompt_name": prompt_name, "user_id": user_id})
+        r = self._session.post(f"{self.base_url}/ab/assign", **self._json_body({"experiment_name": experiment, "prompt_name": prompt_name, "user_id": user_id}, auth=False))
         r.raise_for_status()
-        return r.json()
+        return _loads(r.content)
 
     def record_usage(self, prompt_id: int, user_id: Optional[str], output: Optional[str], success: bool = True, latency_ms: Optional[int] = None, cost: Optional[int] = None):
-        r = requests.post(f"{self.base_url}/usage/", json={"prompt_id": prompt_id, "user_id": user_id, "output": output, "success": success, "latency_ms": latency_ms, "cost": cost})
+        r = self._session.post(f"{self.base_url}/usage/", **self._json_body({"prompt_id": prompt_id, "user_id": user_id, "output": output, "success": success, "latency_ms": latency_ms, "cost": cost}, auth=False))
+        r.raise_for_status()
+        return _loads(r.content)
+
+    def queue_usage(self, prompt_id: int, user_id: Optional[str], output: Optional[str], success: bool = True, latency_ms: Optional[int] = None, cost: Optional[int] = None) -> None:
+        """Record usage without waiting for the request.
+
+        The event is serialized here, so an invalid event raises in the
+        caller. It is then sent in order by a background thread over its own
+        pooled session; send failures are logged, not raised. If the queue is
+        full the event is sent inline instead. Call flush_usage() or close()
+        to wait for queued events.
+        """
+        body = self._json_body({"prompt_id": prompt_id, "user_id": user_id, "output": output, "success": success, "latency_ms": latency_ms, "cost": cost}, auth=False)
+        with self._usage_lock:
+            if self._usage_thread is None:
+                self._usage_thread = threading.Thread(target=self._send_usage, name="prompt-version-hub-usage", daemon=True)
+                self._usage_thread.start()
+        try:
+            self._usage_queue.put_nowait(body)
+        except queue.Full:
+            self._session.post(f"{self.base_url}/usage/", **body).raise_for_status()
+
+    def flush_usage(self) -> None:
+        """Block until every queued usage event has been sent."""
+        self._usage_queue.join()
+
+    def _send_usage(self) -> None:
+        session = _make_session()
+        try:
+            while True:
+                body = self._usage_queue.get()
+                try:
+                    if body is None:
+                        return
+                    session.post(f"{self.base_url}/usage/", **body).raise_for_status()
+                except Exception:
+                    # Never let one event take the sender down; later events
+                    # and flush_usage() depend on this thread staying alive
+                    logger.exception("Failed to record usage event")
+                finally:
+                    self._usage_queue.task_done()
+        finally:
+            session.close()
+
+
+class AsyncClient:
+    """Async counterpart of Client (requires httpx).
+
+    Calls share one connection pool (multiplexed over HTTP/2 when `h2` is
+    installed), so many requests can be awaited concurrently, e.g. with
+    asyncio.gather.
+    """
+
+    def __init__(self, base_url: str, token: Optional[str] = None, compress_requests: bool = False):
+        if httpx is None:
+            raise ImportError("AsyncClient requires httpx (pip install httpx)")
+        self.base_url = base_url.rstrip('/')
+        self.token = token
+        self.compress_requests = compress_requests
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=_HTTP2,
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def _json_body(self, payload: Any, auth: bool = True) -> Dict[str, Any]:
+        headers = self._headers() if auth else {"Content-Type": "application/json"}
+        return {"content": _encode_json(payload, headers, self.compress_requests), "headers": headers}
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def login(self, email: str, password: str) -> str:
+        r = await self._client.post("/auth/login", data={"username": email, "password": password})
+        r.raise_for_status()
+        tok = _loads(r.content)["access_token"]
+        self.token = tok
+        return tok
+
+    async def create_prompt(self, name: str, template: str, variables: List[str]):
+        r = await self._client.post("/prompts/", **self._json_body({"name": name, "template": template, "variables": variables}))
         r.raise_for_status()
-        return r.json()
+        return _loads(r.content)
 
+    async def update_prompt(self, name: str, template: str, variables: List[str]):
+        r = await self._client.put(f"/prompts/{name}", **self._json_body({"template": template, "variables": variables}))
+        r.raise_for_status()
+        return _loads(r.content)
+
+    async def list_versions(self, name: str):
+        r = await self._client.get(f"/prompts/{name}/versions", headers=self._headers())
+        r.raise_for_status()
+        return _loads(r.content)
+
+    async def get_version(self, name: str, version: int):
+        r = await self._client.get(f"/prompts/{name}/versions/{version}", headers=self._headers())
+        r.raise_for_status()
+        return _loads(r.content)
+
+    async def rollback(self, name: str, version: int):
+        r = await self._client.post(f"/prompts/{name}/rollback/{version}", headers=self._headers())
+        r.raise_for_status()
+        return _loads(r.content)
+
+    async def diff(self, name: str, from_version: int, to_version: int):
+        r = await self._client.get(f"/prompts/{name}/diff", params={"from": from_version, "to": to_version}, headers=self._headers())
+        r.raise_for_status()
+        return _loads(r.content)
+
+    async def deploy(self, prompt_name: str, version: int, environment: str):
+        r = await self._client.post("/deployments/", **self._json_body({"prompt_name": prompt_name, "version": version, "environment": environment}))
+        r.raise_for_status()
+        return _loads(r.content)
+
+    async def assign_variant(self, experiment: str, prompt_name: str, user_id: str):
+        r = await self._client.post("/ab/assign", **self._json_body({"experiment_name": experiment, "prompt_name": prompt_name, "user_id": user_id}, auth=False))
+        r.raise_for_status()
+        return _loads(r.content)
+
+    async def record_usage(self, prompt_id: int, user_id: Optional[str], output: Optional[str], success: bool = True, latency_ms: Optional[int] = None, cost: Optional[int] = None):
+        r = await self._client.post("/usage/", **self._json_body({"prompt_id": prompt_id, "user_id": user_id, "output": output, "success": success, "latency_ms": latency_ms, "cost": cost}, auth=False))
+        r.raise_for_status()
+        return _loads(r.content)
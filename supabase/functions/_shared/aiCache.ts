@@ -0,0 +1,69 @@
+/**
+ * Response Cache for AI Edge Functions
+ *
+ * Repeated generation requests (same model, generation config and request
+ * fields) can be answered from memory instead of calling the AI provider
+ * again. Callers include the user id in the key, and still apply quota and
+ * auditing to cached answers. The cache lives in the function instance, so it serves retries and
+ * repeats that reach a warm instance; it is not shared between instances.
+ *
+ * Concurrent identical requests are coalesced regardless of the cache
+ * setting: while one is in flight, the others await its result instead of
+ * making their own provider call.
+ *
+ * Generation runs at a non-zero temperature, so a cached answer is one
+ * sample rather than the only possible one. Caching is therefore opt-in via
+ * `AI_RESPONSE_CACHE_TTL_SECONDS` (0, the default, disables it).
+ */
+
+const AI_RESPONSE_CACHE_TTL_MS = Number(Deno.env.get('AI_RESPONSE_CACHE_TTL_SECONDS') ?? 0) * 1000;
+const AI_RESPONSE_CACHE_MAX_ENTRIES = 256;
+
+const responses = new Map<string, { value: unknown; expiresAt: number }>();
+const inFlight = new Map<string, Promise<unknown>>();
+
+/**
+ * SHA-256 of the JSON encoding of `parts`; callers build `parts` with a fixed key order
+ */
+export async function aiCacheKey(parts: unknown): Promise<string> {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(JSON.stringify(parts)));
+  return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, '0')).join('');
+}
+
+export function getCachedResponse<T>(key: string): T | undefined {
+  const entry = responses.get(key);
+  if (!entry) {
+    return undefined;
+  }
+  if (entry.expiresAt <= Date.now()) {
+    responses.delete(key);
+    return undefined;
+  }
+  return entry.value as T;
+}
+
+export function setCachedResponse(key: string, value: unknown): void {
+  if (AI_RESPONSE_CACHE_TTL_MS <= 0) {
+    return;
+  }
+  if (responses.size >= AI_RESPONSE_CACHE_MAX_ENTRIES) {
+    // Evict the oldest entry (Map keeps insertion order)
+    responses.delete(responses.keys().next().value!);
+  }
+  responses.set(key, { value, expiresAt: Date.now() + AI_RESPONSE_CACHE_TTL_MS });
+}
+
+/**
+ * Run `task` unless an identical request is already in flight, in which case
+ * share its result
+ */
+export function singleFlight<T>(key: string, task: () => Promise<T>): Promise<T> {
+  const pending = inFlight.get(key) as Promise<T> | undefined;
+  if (pending) {
+    return pending;
+  }
+
+  const promise = task().finally(() => inFlight.delete(key));
+  inFlight.set(key, promise);
+  return promise;
+}
@@ -0,0 +1,170 @@
+/**
+ * Shared Auth Helpers for Edge Functions
+ *
+ * Validates the caller's access token and caches the result per warm
+ * instance, so repeated calls with the same token skip the round-trip
+ * to Supabase Auth. Entries live for at most five minutes and never past
+ * the token's own `exp`, so a session revoked before then is still accepted
+ * by a warm instance until its entry lapses.
+ *
+ * When the project's JWT secret is available (`supabase secrets set JWT_SECRET=...`),
+ * HS256 tokens are verified locally instead of calling Supabase Auth. Projects
+ * using asymmetric signing keys can set JWT_JWKS_URL instead; their public keys
+ * are fetched once and cached, so those tokens are verified locally too.
+ */
+
+import { createRemoteJWKSet, decodeProtectedHeader, jwtVerify } from 'https://esm.sh/jose@5.9.6';
+import type { SupabaseClient } from 'https://esm.sh/@supabase/supabase-js@2';
+
+const TOKEN_CACHE_TTL_MS = 5 * 60 * 1000;
+const TOKEN_CACHE_MAX_ENTRIES = 10_000;
+
+const JWT_SECRET = Deno.env.get('JWT_SECRET');
+const JWT_ALGORITHMS = ['HS256'];
+const JWT_AUDIENCE = 'authenticated';
+
+// e.g. https://<project>.supabase.co/auth/v1/.well-known/jwks.json
+const JWT_JWKS_URL = Deno.env.get('JWT_JWKS_URL');
+const JWKS_ALGORITHMS = ['ES256', 'RS256', 'EdDSA'];
+
+const encoder = new TextEncoder();
+
+// Import the HMAC key once per instance; passing the raw secret to jwtVerify
+// would re-run importKey on every verification
+const jwtKey: Promise<CryptoKey> | null = JWT_SECRET
+  ? crypto.subtle.importKey('raw', encoder.encode(JWT_SECRET), { name: 'HMAC', hash: 'SHA-256' }, false, ['verify'])
+  : null;
+
+// jose caches the key set and only refetches it for an unknown key id
+const jwks = JWT_JWKS_URL ? createRemoteJWKSet(new URL(JWT_JWKS_URL)) : null;
+
+export interface AuthUser {
+  id: string;
+  email?: string;
+}
+
+interface CachedToken {
+  user: AuthUser;
+  expiresAt: number;
+}
+
+// Keyed by sha256(token) so raw tokens are never held in memory
+const tokenCache = new Map<string, CachedToken>();
+
+async function hashToken(token: string): Promise<string> {
+  const digest = await crypto.subtle.digest('SHA-256', encoder.encode(token));
+  return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('');
+}
+
+/**
+ * Read the `exp` claim (ms since epoch) without verifying the signature.
+ * Only used to bound the cache TTL of a token that has already been verified.
+ */
+function tokenExpiry(token: string): number | null {
+  try {
+    const payload = token.split('.')[1];
+    const json = atob(payload.replace(/-/g, '+').replace(/_/g, '/'));
+    const { exp } = JSON.parse(json);
+    return typeof exp === 'number' ? exp * 1000 : null;
+  } catch {
+    return null;
+  }
+}
+
+function extractToken(authHeader: string): string {
+  return authHeader.replace(/^Bearer\s+/i, '');
+}
+
+/**
+ * Verify the token signature and claims locally.
+ * Note: unlike getUser(), this does not notice sessions revoked before `exp`.
+ */
+async function verifyLocally(
+  token: string,
+  key: CryptoKey | ReturnType<typeof createRemoteJWKSet>,
+  algorithms: string[]
+): Promise<AuthUser | null> {
+  try {
+    const { payload } = await jwtVerify(token, key as any, {
+      algorithms,
+      audience: JWT_AUDIENCE,
+      requiredClaims: ['sub', 'exp'],
+    });
+    return { id: payload.sub!, email: payload.email as string | undefined };
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Pick a local verifier from the token's `alg`: the shared secret for HS256,
+ * the JWKS for asymmetric keys. Returns undefined when neither is configured
+ * for that algorithm, so the caller falls back to Supabase Auth.
+ */
+async function verifyWithLocalKey(token: string): Promise<AuthUser | null | undefined> {
+  let alg: string | undefined;
+  try {
+    alg = decodeProtectedHeader(token).alg;
+  } catch {
+    return null;
+  }
+
+  if (alg === 'HS256' && jwtKey) {
+    return verifyLocally(token, await jwtKey, JWT_ALGORITHMS);
+  }
+  if (alg && JWKS_ALGORITHMS.includes(alg) && jwks) {
+    return verifyLocally(token, jwks, JWKS_ALGORITHMS);
+  }
+  return undefined;
+}
+
+async function verifyWithAuthServer(
+  supabaseClient: SupabaseClient,
+  token: string
+): Promise<AuthUser | null> {
+  const { data: { user }, error } = await supabaseClient.auth.getUser(token);
+  if (error || !user) {
+    return null;
+  }
+  return { id: user.id, email: user.email };
+}
+
+/**
+ * Resolve the user for an Authorization header, using the token cache when possible
+ */
+export async function getAuthenticatedUser(
+  supabaseClient: SupabaseClient,
+  authHeader: string
+): Promise<AuthUser | null> {
+  const token = extractToken(authHeader);
+  const key = await hashToken(token);
+  const now = Date.now();
+
+  const cached = tokenCache.get(key);
+  if (cached) {
+    if (cached.expiresAt > now) {
+      return cached.user;
+    }
+    tokenCache.delete(key);
+  }
+
+  const local = await verifyWithLocalKey(token);
+  const user = local !== undefined
+    ? local
+    : await verifyWithAuthServer(supabaseClient, token);
+  if (!user) {
+    return null;
+  }
+
+  const exp = tokenExpiry(token);
+  const ttl = Math.min(TOKEN_CACHE_TTL_MS, exp !== null ? exp - now : TOKEN_CACHE_TTL_MS);
+  if (ttl > 0) {
+    if (tokenCache.size >= TOKEN_CACHE_MAX_ENTRIES) {
+      // Map preserves insertion order, so the first key is the oldest entry
+      tokenCache.delete(tokenCache.keys().next().value!);
+    }
+    tokenCache.set(key, { user, expiresAt: now + ttl });
+  }
+
+  return user;
+}
@@ -0,0 +1,20 @@
+/**
+ * Background Work for Edge Functions
+ *
+ * Lets a function send its response before non-essential writes (audit
+ * logs, usage rows) finish. On the Supabase Edge Runtime the promise is
+ * registered with EdgeRuntime.waitUntil so the instance stays alive until
+ * it settles; elsewhere (plain `deno run`) it simply runs unawaited.
+ */
+
+declare const EdgeRuntime: { waitUntil(promise: Promise<unknown>): void } | undefined;
+
+export function runInBackground(label: string, task: PromiseLike<unknown>): void {
+  const promise = Promise.resolve(task).catch((error) => {
+    console.error(`Background task failed (${label}):`, error);
+  });
+
+  if (typeof EdgeRuntime !== 'undefined') {
+    EdgeRuntime.waitUntil(promise);
+  }
+}
@@ -0,0 +1,81 @@
+/**
+ * Shared HTTP Helpers for Edge Functions
+ *
+ * CORS and JSON response headers are built once per instance instead of
+ * being re-spread into a fresh object for every response.
+ *
+ * Allowed origins come from `ALLOWED_ORIGINS` (comma-separated). When it is
+ * unset every origin is allowed, as before. Preflight responses are cacheable
+ * by the browser for `PREFLIGHT_MAX_AGE` seconds.
+ */
+
+type Handler = (req: Request) => Promise<Response>;
+
+interface CorsHeaderSet {
+  response: [string, string][];
+  preflight: Record<string, string>;
+}
+
+const ALLOWED_ORIGINS = (Deno.env.get('ALLOWED_ORIGINS') ?? '')
+  .split(',')
+  .map((origin) => origin.trim())
+  .filter(Boolean);
+const PREFLIGHT_MAX_AGE = '86400';
+
+const JSON_HEADERS = { 'Content-Type': 'application/json' };
+
+function buildCorsHeaders(origin: string): CorsHeaderSet {
+  const headers: Record<string, string> = {
+    'Access-Control-Allow-Origin': origin,
+    'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
+  };
+  if (origin !== '*') {
+    headers['Vary'] = 'Origin';
+  }
+
+  return {
+    response: Object.entries(headers),
+    preflight: {
+      ...headers,
+      'Access-Control-Allow-Methods': 'POST',
+      'Access-Control-Max-Age': PREFLIGHT_MAX_AGE,
+    },
+  };
+}
+
+const wildcardCors = buildCorsHeaders('*');
+const corsByOrigin = new Map(ALLOWED_ORIGINS.map((origin) => [origin, buildCorsHeaders(origin)]));
+
+function corsHeadersFor(origin: string | null): CorsHeaderSet {
+  if (ALLOWED_ORIGINS.length === 0) {
+    return wildcardCors;
+  }
+  // Disallowed origins get the first allowed origin, which the browser will reject
+  return (origin && corsByOrigin.get(origin)) || corsByOrigin.get(ALLOWED_ORIGINS[0])!;
+}
+
+/**
+ * Wrap a handler with CORS: answers preflight requests and adds CORS headers to every response
+ */
+export function withCors(handler: Handler): Handler {
+  return async (req) => {
+    const cors = corsHeadersFor(req.headers.get('Origin'));
+
+    if (req.method === 'OPTIONS') {
+      return new Response(null, { status: 204, headers: cors.preflight });
+    }
+
+    const response = await handler(req);
+    for (const [name, value] of cors.response) {
+      response.headers.set(name, value);
+    }
+    return response;
+  };
+}
+
+/**
+ * Serialize `body` as a JSON response
+ */
+export function jsonResponse(body: unknown, status = 200): Response {
+  return new Response(JSON.stringify(body), { status, headers: JSON_HEADERS });
+}
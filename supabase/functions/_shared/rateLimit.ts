@@ -0,0 +1,76 @@
+/**
+ * Shared AI Rate Limit for Edge Functions
+ *
+ * Every function that calls the AI provider draws from the same daily
+ * per-user budget (`AI_MAX_REQUESTS_PER_USER_PER_DAY`, default 50), backed
+ * by the `bump_ai_usage` counter from migration 00004. The budget is a
+ * calendar-day counter that resets at midnight, not a rolling 24h window.
+ * Requests are charged before the provider is called; callers refund the
+ * charge with `refundAiQuota` when the request then fails.
+ */
+
+import type { SupabaseClient } from 'https://esm.sh/@supabase/supabase-js@2';
+
+import { createServiceClient } from './supabase.ts';
+
+export const AI_MAX_REQUESTS_PER_DAY = Number(Deno.env.get('AI_MAX_REQUESTS_PER_USER_PER_DAY') ?? 50);
+export const AI_QUOTA_EXCEEDED_MESSAGE = `Daily AI generation limit reached (${AI_MAX_REQUESTS_PER_DAY} requests)`;
+
+// bump_ai_usage keys counters by CURRENT_DATE, which is the UTC date on Supabase
+function utcDay(): string {
+  return new Date().toISOString().slice(0, 10);
+}
+
+export interface AiQuotaCharge {
+  allowed: boolean;
+  userId: string;
+  // Counter day that was bumped; null when the COUNT fallback charged nothing
+  day: string | null;
+}
+
+/**
+ * Count one AI request against the caller's daily budget.
+ * `allowed` is false when the budget is already used up.
+ */
+export async function consumeAiQuota(
+  supabaseClient: SupabaseClient,
+  userId: string
+): Promise<AiQuotaCharge> {
+  const day = utcDay();
+  const { data: bumped, error } = await supabaseClient.rpc('bump_ai_usage', {
+    max_per_day: AI_MAX_REQUESTS_PER_DAY,
+  });
+
+  if (!error) {
+    return { allowed: bumped === true, userId, day };
+  }
+
+  // Counter unavailable (e.g. migration not applied yet): fall back to counting generations
+  console.warn('AI usage counter unavailable, falling back to COUNT:', error.message);
+  const oneDayAgo = new Date(Date.now() - 24 * 60 * 60 * 1000).toISOString();
+  const { count } = await supabaseClient
+    .from('ai_generations')
+    .select('*', { count: 'exact', head: true })
+    .eq('user_id', userId)
+    .gte('created_at', oneDayAgo);
+  return { allowed: (count ?? 0) < AI_MAX_REQUESTS_PER_DAY, userId, day: null };
+}
+
+/**
+ * Give back a request charged by consumeAiQuota after the AI call failed.
+ * Runs with the service role, since callers may not refund themselves.
+ * Best effort: a failed refund is logged, not raised.
+ */
+export async function refundAiQuota(charge: AiQuotaCharge): Promise<void> {
+  if (!charge.day) {
+    return;
+  }
+
+  const { error } = await createServiceClient().rpc('refund_ai_usage', {
+    target_user_id: charge.userId,
+    charged_day: charge.day,
+  });
+  if (error) {
+    console.warn('Could not refund AI usage:', error.message);
+  }
+}
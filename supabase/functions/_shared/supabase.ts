@@ -0,0 +1,46 @@
+/**
+ * Shared Supabase Client Factory for Edge Functions
+ *
+ * Builds the per-request client that acts on behalf of the caller (so RLS
+ * still applies). Session persistence and token auto-refresh are disabled:
+ * the client lives for a single request, so storage writes and refresh
+ * timers are pure overhead.
+ *
+ * A service-role client is also available for the few writes callers must not
+ * be able to make themselves, such as refunding the AI quota.
+ */
+
+import { createClient, type SupabaseClient } from 'https://esm.sh/@supabase/supabase-js@2';
+
+const SUPABASE_URL = Deno.env.get('SUPABASE_URL') ?? '';
+const SUPABASE_ANON_KEY = Deno.env.get('SUPABASE_ANON_KEY') ?? '';
+const SUPABASE_SERVICE_ROLE_KEY = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY') ?? '';
+
+// Carries no per-request state, so one instance serves every request
+let serviceClient: SupabaseClient | null = null;
+
+export function createUserClient(authHeader: string): SupabaseClient {
+  return createClient(SUPABASE_URL, SUPABASE_ANON_KEY, {
+    global: { headers: { Authorization: authHeader } },
+    auth: {
+      persistSession: false,
+      autoRefreshToken: false,
+      detectSessionInUrl: false,
+    },
+  });
+}
+
+/**
+ * Client authenticated with the service role key. Bypasses RLS: only use it
+ * for writes scoped to an explicit, already verified user id.
+ */
+export function createServiceClient(): SupabaseClient {
+  serviceClient ??= createClient(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, {
+    auth: {
+      persistSession: false,
+      autoRefreshToken: false,
+      detectSessionInUrl: false,
+    },
+  });
+  return serviceClient;
+}
@@ -4,61 +4,89 @@
  * Generates a prompt template using Google Gemini AI
  */
 
-import { serve } from 'https://deno.land/std@0.168.0/http/server.ts';
-import { createClient } from 'https://esm.sh/@supabase/supabase-js@2';
+import {
+  aiCacheKey,
+  getCachedResponse,
+  setCachedResponse,
+  singleFlight,
+} from '../_shared/aiCache.ts';
+import { getAuthenticatedUser } from '../_shared/auth.ts';
+import { runInBackground } from '../_shared/background.ts';
+import { jsonResponse, withCors } from '../_shared/http.ts';
+import {
+  AI_QUOTA_EXCEEDED_MESSAGE,
+  type AiQuotaCharge,
+  consumeAiQuota,
+  refundAiQuota,
+} from '../_shared/rateLimit.ts';
+import { createUserClient } from '../_shared/supabase.ts';
 
 const GEMINI_API_KEY = Deno.env.get('GOOGLE_GENAI_API_KEY');
 const GEMINI_MODEL = Deno.env.get('GOOGLE_GENAI_MODEL') || 'gemini-2.0-flash-exp';
-
-const corsHeaders = {
-  'Access-Control-Allow-Origin': '*',
-  'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
+const GEMINI_TIMEOUT_MS = 30_000;
+// {{variable_name}} placeholders; compiled once per instance
+const VARIABLE_PATTERN = /\{\{(\w+)\}\}/g;
+const GENERATION_CONFIG = {
+  temperature: 0.7,
+  maxOutputTokens: 2048,
 };
 
-serve(async (req) => {
-  // Handle CORS preflight
-  if (req.method === 'OPTIONS') {
-    return new Response(null, {
-      status: 204,
-      headers: {
-        ...corsHeaders,
-        'Access-Control-Allow-Methods': 'POST',
-      },
-    });
+// Fixed instructions that end every meta-prompt
+const META_PROMPT_INSTRUCTIONS = `
+
+Please generate a prompt template that:
+1. Is clear, concise, and follows best practices
+2. Uses {{variable_name}} format for dynamic variables
+3. Includes appropriate instructions and context
+4. Is optimized for the specified tone and output format
+
+Respond with a JSON object containing:
+- prompt_template: the generated prompt (string)
+- variables: array of variable names found in the template (e.g., ["user_name", "product_id"])
+- suggestions: array of improvement suggestions (strings)
+`;
+
+/**
+ * Count whitespace-separated words in one pass, without splitting the text into an array
+ */
+function countWords(text: string): number {
+  let words = 0;
+  let inWord = false;
+  for (let i = 0; i < text.length; i++) {
+    const code = text.charCodeAt(i);
+    // space, \t, \n, \v, \f, \r
+    const isSpace = code === 32 || (code >= 9 && code <= 13);
+    if (!isSpace && !inWord) {
+      words++;
+    }
+    inWord = !isSpace;
   }
+  return words;
+}
+
+Deno.serve(withCors(async (req) => {
+  // Set once the caller has been charged, so a failure can refund them
+  let charge: AiQuotaCharge | null = null;
 
   try {
     // Verify authentication
     const authHeader = req.headers.get('Authorization');
     if (!authHeader) {
-      return new Response(JSON.stringify({ error: 'Missing authorization header' }), {
-        status: 401,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-      });
+      return jsonResponse({ error: 'Missing authorization header' }, 401);
     }
 
     // Create Supabase client
-    const supabaseClient = createClient(
-      Deno.env.get('SUPABASE_URL') ?? '',
-      Deno.env.get('SUPABASE_ANON_KEY') ?? '',
-      { global: { headers: { Authorization: authHeader } } }
-    );
+    const supabaseClient = createUserClient(authHeader);
 
     // Get user
-    const { data: { user }, error: userError } = await supabaseClient.auth.getUser();
-    if (userError || !user) {
-      return new Response(JSON.stringify({ error: 'Unauthorized' }), {
-        status: 401,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-      });
+    const user = await getAuthenticatedUser(supabaseClient, authHeader);
+    if (!user) {
+      return jsonResponse({ error: 'Unauthorized' }, 401);
     }
 
     // Check API key
     if (!GEMINI_API_KEY) {
-      return new Response(JSON.stringify({ error: 'AI service not configured' }), {
-        status: 500,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-      });
+      return jsonResponse({ error: 'AI service not configured' }, 500);
     }
 
     // Parse request body
@@ -74,131 +102,147 @@ serve(async (req) => {
     } = await req.json();
 
     if (!goal || goal.length < 10 || goal.length > 1000) {
-      return new Response(JSON.stringify({ error: 'Goal must be between 10 and 1000 characters' }), {
-        status: 400,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-      });
+      return jsonResponse({ error: 'Goal must be between 10 and 1000 characters' }, 400);
     }
 
-    // Check rate limit (50 per day per user)
-    const oneDayAgo = new Date(Date.now() - 24 * 60 * 60 * 1000).toISOString();
-    const { count } = await supabaseClient
-      .from('ai_generations')
-      .select('*', { count: 'exact', head: true })
-      .eq('user_id', user.id)
-      .gte('created_at', oneDayAgo);
-
-    if (count && count >= 50) {
-      return new Response(JSON.stringify({ error: 'Daily AI generation limit reached (50 requests)' }), {
-        status: 429,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+    // Check rate limit (daily counter per user); cached and shared results
+    // below count against it like fresh generations
+    const quota = await consumeAiQuota(supabaseClient, user.id);
+    if (!quota.allowed) {
+      return jsonResponse({ error: AI_QUOTA_EXCEEDED_MESSAGE }, 429);
+    }
+    charge = quota;
+
+    const requestData = { goal, industry, target_audience, tone, output_format, context, constraints, examples };
+
+    // Audit row per served response, written after responding; it is not
+    // needed for the response itself
+    const logGeneration = (result: any) => {
+      const insert = supabaseClient.from('ai_generations').insert({
+        user_id: user.id,
+        request_data: requestData,
+        response_data: result,
+        prompt_template: result.prompt_template,
+        variables: result.variables,
+        ai_provider: 'google',
+        ai_model: GEMINI_MODEL,
+        tokens_used: null, // Gemini doesn't provide this in the free tier
+        cost_cents: null,
+      }).then(({ error }) => {
+        if (error) throw error;
       });
+      runInBackground('log ai_generation', insert);
+    };
+
+    // A user's identical requests are served from the response cache (when
+    // enabled) without calling Gemini again; entries are never shared
+    // between users
+    const cacheKey = await aiCacheKey({
+      user_id: user.id,
+      model: GEMINI_MODEL,
+      config: GENERATION_CONFIG,
+      request: requestData,
+    });
+    const cached = getCachedResponse(cacheKey);
+    if (cached) {
+      logGeneration(cached);
+      return jsonResponse(cached);
     }
 
-    // Build the AI prompt
-    let aiPrompt = `You are an expert prompt engineer. Generate a professional, production-ready prompt template based on the following requirements:\n\n`;
-    aiPrompt += `Goal: ${goal}\n`;
-    if (industry) aiPrompt += `Industry: ${industry}\n`;
-    if (target_audience) aiPrompt += `Target Audience: ${target_audience}\n`;
-    aiPrompt += `Tone: ${tone}\n`;
-    aiPrompt += `Output Format: ${output_format}\n`;
-    if (context) aiPrompt += `Additional Context: ${context}\n`;
-    if (constraints) aiPrompt += `Constraints: ${constraints}\n`;
-    if (examples) aiPrompt += `Examples: ${examples}\n`;
-
-    aiPrompt += `\n\nPlease generate a prompt template that:\n`;
-    aiPrompt += `1. Is clear, concise, and follows best practices\n`;
-    aiPrompt += `2. Uses {{variable_name}} format for dynamic variables\n`;
-    aiPrompt += `3. Includes appropriate instructions and context\n`;
-    aiPrompt += `4. Is optimized for the specified tone and output format\n\n`;
-    aiPrompt += `Respond with a JSON object containing:\n`;
-    aiPrompt += `- prompt_template: the generated prompt (string)\n`;
-    aiPrompt += `- variables: array of variable names found in the template (e.g., ["user_name", "product_id"])\n`;
-    aiPrompt += `- suggestions: array of improvement suggestions (strings)\n`;
-
-    // Call Google Gemini API
-    const geminiResponse = await fetch(
-      `https://generativelanguage.googleapis.com/v1beta/models/${GEMINI_MODEL}:generateContent?key=${GEMINI_API_KEY}`,
-      {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          contents: [{
-            parts: [{ text: aiPrompt }],
-          }],
-          generationConfig: {
-            temperature: 0.7,
-            maxOutputTokens: 2048,
-          },
-        }),
+    // Concurrent identical requests share one Gemini call; each caller has
+    // already been charged above and gets its own audit row below
+    const generated = await singleFlight(cacheKey, async () => {
+      // Build the AI prompt from parts joined once, instead of re-copying it on every append
+      const promptParts = [
+        'You are an expert prompt engineer. Generate a professional, production-ready prompt template based on the following requirements:\n',
+        `Goal: ${goal}`,
+      ];
+      if (industry) promptParts.push(`Industry: ${industry}`);
+      if (target_audience) promptParts.push(`Target Audience: ${target_audience}`);
+      promptParts.push(`Tone: ${tone}`, `Output Format: ${output_format}`);
+      if (context) promptParts.push(`Additional Context: ${context}`);
+      if (constraints) promptParts.push(`Constraints: ${constraints}`);
+      if (examples) promptParts.push(`Examples: ${examples}`);
+      promptParts.push(META_PROMPT_INSTRUCTIONS);
+      const aiPrompt = promptParts.join('\n');
+
+      // Call Google Gemini API
+      const geminiResponse = await fetch(
+        `https://generativelanguage.googleapis.com/v1beta/models/${GEMINI_MODEL}:generateContent?key=${GEMINI_API_KEY}`,
+        {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          // Give up on a stalled provider instead of holding the invocation open
+          signal: AbortSignal.timeout(GEMINI_TIMEOUT_MS),
+          body: JSON.stringify({
+            contents: [{
+              parts: [{ text: aiPrompt }],
+            }],
+            generationConfig: GENERATION_CONFIG,
+          }),
+        }
+      );
+
+      if (!geminiResponse.ok) {
+        const errorText = await geminiResponse.text();
+        throw new Error(`Gemini API error: ${errorText}`);
       }
-    );
 
-    if (!geminiResponse.ok) {
-      const errorText = await geminiResponse.text();
-      throw new Error(`Gemini API error: ${errorText}`);
-    }
+      const geminiData = await geminiResponse.json();
+      const responseText = geminiData.candidates?.[0]?.content?.parts?.[0]?.text;
 
-    const geminiData = await geminiResponse.json();
-    const responseText = geminiData.candidates?.[0]?.content?.parts?.[0]?.text;
+      if (!responseText) {
+        throw new Error('No response from AI');
+      }
 
-    if (!responseText) {
-      throw new Error('No response from AI');
-    }
+      // Parse the JSON response
+      const jsonMatch = responseText.match(/\{[\s\S]*\}/);
+      let result;
+
+      if (jsonMatch) {
+        result = JSON.parse(jsonMatch[0]);
+      } else {
+        // Fallback if AI didn't return JSON
+        result = {
+          prompt_template: responseText,
+          variables: [],
+          suggestions: [],
+        };
+      }
 
-    // Parse the JSON response
-    const jsonMatch = responseText.match(/\{[\s\S]*\}/);
-    let result;
-
-    if (jsonMatch) {
-      result = JSON.parse(jsonMatch[0]);
-    } else {
-      // Fallback if AI didn't return JSON
-      result = {
-        prompt_template: responseText,
-        variables: [],
-        suggestions: [],
-      };
-    }
+      // Extract variables if not provided
+      if (!result.variables || result.variables.length === 0) {
+        // One scan, reading the name from the capture group
+        result.variables = Array.from(result.prompt_template.matchAll(VARIABLE_PATTERN), (m: RegExpMatchArray) => m[1]);
+      }
 
-    // Extract variables if not provided
-    if (!result.variables || result.variables.length === 0) {
-      const variableMatches = result.prompt_template.match(/\{\{(\w+)\}\}/g) || [];
-      result.variables = variableMatches.map((v: string) => v.replace(/\{\{|\}\}/g, ''));
-    }
+      // Calculate metadata
+      const charCount = result.prompt_template.length;
+      const wordCount = countWords(result.prompt_template);
 
-    // Calculate metadata
-    const charCount = result.prompt_template.length;
-    const wordCount = result.prompt_template.split(/\s+/).length;
+      result.metadata = {
+        char_count: charCount,
+        word_count: wordCount,
+        variable_count: result.variables.length,
+        complexity: wordCount > 200 ? 'complex' : wordCount > 100 ? 'moderate' : 'simple',
+      };
 
-    result.metadata = {
-      char_count: charCount,
-      word_count: wordCount,
-      variable_count: result.variables.length,
-      complexity: wordCount > 200 ? 'complex' : wordCount > 100 ? 'moderate' : 'simple',
-    };
+      setCachedResponse(cacheKey, result);
 
-    // Store in database
-    await supabaseClient.from('ai_generations').insert({
-      user_id: user.id,
-      request_data: { goal, industry, target_audience, tone, output_format, context, constraints, examples },
-      response_data: result,
-      prompt_template: result.prompt_template,
-      variables: result.variables,
-      ai_provider: 'google',
-      ai_model: GEMINI_MODEL,
-      tokens_used: null, // Gemini doesn't provide this in the free tier
-      cost_cents: null,
+      return result;
     });
 
-    return new Response(JSON.stringify(result), {
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-    });
+    logGeneration(generated);
+    return jsonResponse(generated);
   } catch (error) {
     console.error('Error generating prompt:', error);
-    return new Response(JSON.stringify({ error: error.message }), {
-      status: 500,
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-    });
+    // A failed request should not use up the caller's daily budget
+    if (charge) {
+      await refundAiQuota(charge);
+    }
+    if (error.name === 'TimeoutError') {
+      return jsonResponse({ error: 'AI service timed out' }, 504);
+    }
+    return jsonResponse({ error: error.message }, 500);
   }
-});
+}));
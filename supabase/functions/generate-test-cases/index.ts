@@ -4,60 +4,53 @@
  * Generates test cases for a prompt using Google Gemini AI
  */
 
-import { serve } from 'https://deno.land/std@0.168.0/http/server.ts';
-import { createClient } from 'https://esm.sh/@supabase/supabase-js@2';
+import { getAuthenticatedUser } from '../_shared/auth.ts';
+import { jsonResponse, withCors } from '../_shared/http.ts';
+import {
+  AI_QUOTA_EXCEEDED_MESSAGE,
+  type AiQuotaCharge,
+  consumeAiQuota,
+  refundAiQuota,
+} from '../_shared/rateLimit.ts';
+import { createUserClient } from '../_shared/supabase.ts';
 
 const GEMINI_API_KEY = Deno.env.get('GOOGLE_GENAI_API_KEY');
 const GEMINI_MODEL = Deno.env.get('GOOGLE_GENAI_MODEL') || 'gemini-2.0-flash-exp';
+const GEMINI_TIMEOUT_MS = 30_000;
 
-const corsHeaders = {
-  'Access-Control-Allow-Origin': '*',
-  'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
-};
-
-serve(async (req) => {
-  // Handle CORS preflight
-  if (req.method === 'OPTIONS') {
-    return new Response(null, {
-      status: 204,
-      headers: {
-        ...corsHeaders,
-        'Access-Control-Allow-Methods': 'POST',
-      },
-    });
-  }
+// Values of the test_category enum; anything else the model returns is
+// stored as happy_path rather than failing the whole insert
+const TEST_CATEGORIES = new Set(['happy_path', 'edge_case', 'boundary', 'negative']);
+
+Deno.serve(withCors(async (req) => {
+  // Set once the caller has been charged, so a failure can refund them
+  let charge: AiQuotaCharge | null = null;
 
   try {
     const authHeader = req.headers.get('Authorization');
     if (!authHeader) {
-      return new Response(JSON.stringify({ error: 'Unauthorized' }), {
-        status: 401,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-      });
+      return jsonResponse({ error: 'Unauthorized' }, 401);
     }
 
-    const supabaseClient = createClient(
-      Deno.env.get('SUPABASE_URL') ?? '',
-      Deno.env.get('SUPABASE_ANON_KEY') ?? '',
-      { global: { headers: { Authorization: authHeader } } }
-    );
+    const supabaseClient = createUserClient(authHeader);
 
-    const { data: { user }, error: userError } = await supabaseClient.auth.getUser();
-    if (userError || !user) {
-      return new Response(JSON.stringify({ error: 'Unauthorized' }), {
-        status: 401,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-      });
+    const user = await getAuthenticatedUser(supabaseClient, authHeader);
+    if (!user) {
+      return jsonResponse({ error: 'Unauthorized' }, 401);
     }
 
     const { prompt_id, prompt_template, prompt_variables, count = 5, user_id } = await req.json();
 
     if (!GEMINI_API_KEY) {
-      return new Response(JSON.stringify({ error: 'AI service not configured' }), {
-        status: 500,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-      });
+      return jsonResponse({ error: 'AI service not configured' }, 500);
+    }
+
+    // Check rate limit (shares the daily AI budget with generate-prompt)
+    const quota = await consumeAiQuota(supabaseClient, user.id);
+    if (!quota.allowed) {
+      return jsonResponse({ error: AI_QUOTA_EXCEEDED_MESSAGE }, 429);
     }
+    charge = quota;
 
     // Build AI prompt
     let aiPrompt = `You are a QA engineer. Generate ${count} diverse test cases for the following prompt template:\n\n`;
@@ -79,6 +72,8 @@ serve(async (req) => {
       {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
+        // Give up on a stalled provider instead of holding the invocation open
+        signal: AbortSignal.timeout(GEMINI_TIMEOUT_MS),
         body: JSON.stringify({
           contents: [{ parts: [{ text: aiPrompt }] }],
           generationConfig: { temperature: 0.8, maxOutputTokens: 2048 },
@@ -95,36 +90,38 @@ serve(async (req) => {
     const jsonMatch = responseText.match(/\[[\s\S]*\]/);
     const testCasesData = jsonMatch ? JSON.parse(jsonMatch[0]) : [];
 
-    // Insert test cases into database
-    const testCases = await Promise.all(
-      testCasesData.map(async (tc: any) => {
-        const { data, error } = await supabaseClient
-          .from('test_cases')
-          .insert({
+    // Insert all test cases with one multi-row INSERT
+    let testCases: unknown[] = [];
+    if (testCasesData.length > 0) {
+      const { data, error } = await supabaseClient
+        .from('test_cases')
+        .insert(
+          testCasesData.map((tc: any) => ({
             prompt_id,
             name: tc.name,
             input_text: tc.input_text,
             expected_output: tc.expected_output || null,
-            category: tc.category || 'happy_path',
+            category: TEST_CATEGORIES.has(tc.category) ? tc.category : 'happy_path',
             auto_generated: true,
             created_by: user_id,
-          })
-          .select()
-          .single();
+          }))
+        )
+        .select();
 
-        if (error) throw error;
-        return data;
-      })
-    );
+      if (error) throw error;
+      testCases = data;
+    }
 
-    return new Response(JSON.stringify({ test_cases: testCases }), {
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-    });
+    return jsonResponse({ test_cases: testCases });
   } catch (error) {
     console.error('Error:', error);
-    return new Response(JSON.stringify({ error: error.message }), {
-      status: 500,
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-    });
+    // A failed request should not use up the caller's daily budget
+    if (charge) {
+      await refundAiQuota(charge);
+    }
+    if (error.name === 'TimeoutError') {
+      return jsonResponse({ error: 'AI service timed out' }, 504);
+    }
+    return jsonResponse({ error: error.message }, 500);
   }
-});
+}));
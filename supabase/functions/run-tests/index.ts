@@ -4,95 +4,63 @@
  * Executes test cases for a prompt (mock implementation)
  */
 
-import { serve } from 'https://deno.land/std@0.168.0/http/server.ts';
-import { createClient } from 'https://esm.sh/@supabase/supabase-js@2';
-
-const corsHeaders = {
-  'Access-Control-Allow-Origin': '*',
-  'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
-};
-
-serve(async (req) => {
-  // Handle CORS preflight
-  if (req.method === 'OPTIONS') {
-    return new Response(null, {
-      status: 204,
-      headers: {
-        ...corsHeaders,
-        'Access-Control-Allow-Methods': 'POST',
-      },
-    });
-  }
+import { getAuthenticatedUser } from '../_shared/auth.ts';
+import { jsonResponse, withCors } from '../_shared/http.ts';
+import { createUserClient } from '../_shared/supabase.ts';
 
+Deno.serve(withCors(async (req) => {
   try {
     const authHeader = req.headers.get('Authorization');
     if (!authHeader) {
-      return new Response(JSON.stringify({ error: 'Unauthorized' }), {
-        status: 401,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-      });
+      return jsonResponse({ error: 'Unauthorized' }, 401);
     }
 
-    const supabaseClient = createClient(
-      Deno.env.get('SUPABASE_URL') ?? '',
-      Deno.env.get('SUPABASE_ANON_KEY') ?? '',
-      { global: { headers: { Authorization: authHeader } } }
-    );
+    const supabaseClient = createUserClient(authHeader);
 
-    const { data: { user }, error: userError } = await supabaseClient.auth.getUser();
-    if (userError || !user) {
-      return new Response(JSON.stringify({ error: 'Unauthorized' }), {
-        status: 401,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-      });
+    const user = await getAuthenticatedUser(supabaseClient, authHeader);
+    if (!user) {
+      return jsonResponse({ error: 'Unauthorized' }, 401);
     }
 
     const { prompt_id, prompt_version, prompt_template, prompt_variables, test_cases, user_id } = await req.json();
 
     // Run each test case (this is a mock implementation)
     // In a real scenario, you would execute the prompt with the test input
-    const testRuns = await Promise.all(
-      test_cases.map(async (testCase: any) => {
-        const startTime = Date.now();
+    const runs = test_cases.map((testCase: any) => {
+      const startTime = Date.now();
 
-        // Mock execution - in reality, you'd call your LLM here
-        const mockOutput = `Executed prompt with input: ${testCase.input_text.substring(0, 50)}...`;
-        const success = Math.random() > 0.1; // 90% success rate for demo
-        const latency = Math.floor(Math.random() * 2000) + 500; // 500-2500ms
+      // Mock execution - in reality, you'd call your LLM here
+      const mockOutput = `Executed prompt with input: ${testCase.input_text.substring(0, 50)}...`;
+      const success = Math.random() > 0.1; // 90% success rate for demo
 
-        const endTime = Date.now();
+      const endTime = Date.now();
 
-        const { data, error } = await supabaseClient
-          .from('test_runs')
-          .insert({
-            prompt_id,
-            prompt_version,
-            test_case_id: testCase.id,
-            input_text: testCase.input_text,
-            output_text: mockOutput,
-            success,
-            latency_ms: endTime - startTime,
-            tokens_used: Math.floor(Math.random() * 500) + 100,
-            cost_cents: Math.floor(Math.random() * 10) + 1,
-            error_message: success ? null : 'Mock error for testing',
-            executed_by: user_id,
-          })
-          .select()
-          .single();
+      return {
+        prompt_id,
+        prompt_version,
+        test_case_id: testCase.id,
+        input_text: testCase.input_text,
+        output_text: mockOutput,
+        success,
+        latency_ms: endTime - startTime,
+        tokens_used: Math.floor(Math.random() * 500) + 100,
+        cost_cents: Math.floor(Math.random() * 10) + 1,
+        error_message: success ? null : 'Mock error for testing',
+        executed_by: user_id,
+      };
+    });
 
-        if (error) throw error;
-        return data;
-      })
-    );
+    // Record every run with a single multi-row insert
+    const { data: testRuns, error } = await supabaseClient
+      .from('test_runs')
+      .insert(runs)
+      .select();
 
-    return new Response(JSON.stringify({ test_runs: testRuns }), {
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-    });
+    if (error) throw error;
+
+    return jsonResponse({ test_runs: testRuns });
   } catch (error) {
     console.error('Error:', error);
-    return new Response(JSON.stringify({ error: error.message }), {
-      status: 500,
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' },
-    });
+    return jsonResponse({ error: error.message }, 500);
   }
-});
+}));
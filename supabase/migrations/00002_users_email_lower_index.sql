@@ -0,0 +1,23 @@
+-- ================================
+-- Case-insensitive unique index on users.email
+-- ================================
+-- Emails are normalized to lower case when the profile row is created, and
+-- uniqueness is enforced on lower(email) so accounts cannot differ only by
+-- case. This index replaces the plain UNIQUE constraint, which would
+-- otherwise be a second, redundant index on the same column.
+
+UPDATE users SET email = lower(email) WHERE email <> lower(email);
+
+CREATE UNIQUE INDEX ix_users_email_lower ON users (lower(email));
+
+ALTER TABLE users DROP CONSTRAINT users_email_key;
+
+-- Normalize emails for new signups
+CREATE OR REPLACE FUNCTION handle_new_user()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO public.users (id, email, role)
+    VALUES (NEW.id, lower(NEW.email), 'editor');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
@@ -0,0 +1,123 @@
+-- ================================
+-- RLS role-check helper
+-- ================================
+-- Role-gated policies used to repeat
+--   EXISTS (SELECT 1 FROM users WHERE id = auth.uid() AND role IN (...))
+-- which Postgres re-evaluates for every candidate row. The checks now go
+-- through a single STABLE function, wrapped in a scalar subquery so the
+-- planner evaluates it once per statement (an InitPlan) instead of per row.
+-- SECURITY DEFINER also keeps the users lookup from recursing into the
+-- users table's own RLS policies.
+
+CREATE OR REPLACE FUNCTION public.current_user_role()
+RETURNS user_role
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    SELECT role FROM users WHERE id = auth.uid()
+$$;
+
+-- ================================
+-- Users
+-- ================================
+
+DROP POLICY "Admins can view all users" ON users;
+CREATE POLICY "Admins can view all users"
+    ON users FOR SELECT
+    USING ((SELECT current_user_role()) = 'admin');
+
+-- ================================
+-- Prompts
+-- ================================
+
+DROP POLICY "Editors and admins can create prompts" ON prompts;
+CREATE POLICY "Editors and admins can create prompts"
+    ON prompts FOR INSERT
+    WITH CHECK (
+        created_by = (SELECT auth.uid()) AND
+        (SELECT current_user_role()) IN ('admin', 'editor')
+    );
+
+DROP POLICY "Users can update own prompts" ON prompts;
+CREATE POLICY "Users can update own prompts"
+    ON prompts FOR UPDATE
+    USING (
+        created_by = (SELECT auth.uid()) AND
+        (SELECT current_user_role()) IN ('admin', 'editor')
+    );
+
+DROP POLICY "Admins can delete prompts" ON prompts;
+CREATE POLICY "Admins can delete prompts"
+    ON prompts FOR DELETE
+    USING ((SELECT current_user_role()) = 'admin');
+
+-- ================================
+-- Deployments
+-- ================================
+
+DROP POLICY "Editors and admins can create deployments" ON deployments;
+CREATE POLICY "Editors and admins can create deployments"
+    ON deployments FOR INSERT
+    WITH CHECK (
+        deployed_by = (SELECT auth.uid()) AND
+        (SELECT current_user_role()) IN ('admin', 'editor')
+    );
+
+-- ================================
+-- AB Policies
+-- ================================
+
+DROP POLICY "Editors and admins can create AB policies" ON ab_policies;
+CREATE POLICY "Editors and admins can create AB policies"
+    ON ab_policies FOR INSERT
+    WITH CHECK (
+        created_by = (SELECT auth.uid()) AND
+        (SELECT current_user_role()) IN ('admin', 'editor')
+    );
+
+-- ================================
+-- Test Cases
+-- ================================
+
+DROP POLICY "Editors and admins can create test cases" ON test_cases;
+CREATE POLICY "Editors and admins can create test cases"
+    ON test_cases FOR INSERT
+    WITH CHECK ((SELECT current_user_role()) IN ('admin', 'editor'));
+
+DROP POLICY "Users can update test cases for own prompts" ON test_cases;
+CREATE POLICY "Users can update test cases for own prompts"
+    ON test_cases FOR UPDATE
+    USING (
+        (SELECT current_user_role()) IN ('admin', 'editor') AND
+        EXISTS (
+            SELECT 1 FROM prompts
+            WHERE prompts.id = test_cases.prompt_id
+            AND prompts.created_by = (SELECT auth.uid())
+        )
+    );
+
+DROP POLICY "Users can delete test cases for own prompts" ON test_cases;
+CREATE POLICY "Users can delete test cases for own prompts"
+    ON test_cases FOR DELETE
+    USING (
+        (SELECT current_user_role()) IN ('admin', 'editor') AND
+        EXISTS (
+            SELECT 1 FROM prompts
+            WHERE prompts.id = test_cases.prompt_id
+            AND prompts.created_by = (SELECT auth.uid())
+        )
+    );
+
+-- ================================
+-- Test Runs
+-- ================================
+
+DROP POLICY "Editors and admins can create test runs" ON test_runs;
+CREATE POLICY "Editors and admins can create test runs"
+    ON test_runs FOR INSERT
+    WITH CHECK (
+        executed_by = (SELECT auth.uid()) AND
+        (SELECT current_user_role()) IN ('admin', 'editor')
+    );
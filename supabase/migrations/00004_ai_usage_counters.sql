@@ -0,0 +1,37 @@
+-- ================================
+-- Per-user daily AI usage counters
+-- ================================
+-- The generate-prompt rate limit used to COUNT(*) the caller's
+-- ai_generations rows for the last 24h on every request. A fixed daily
+-- window counter turns that into a single-row upsert. ai_generations stays
+-- as the audit log but is no longer read on the hot path.
+
+CREATE TABLE ai_usage_counters (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    day DATE NOT NULL DEFAULT CURRENT_DATE,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day)
+);
+
+ALTER TABLE ai_usage_counters ENABLE ROW LEVEL SECURITY;
+
+-- Users can view their own counters (writes go through bump_ai_usage)
+CREATE POLICY "Users can view own AI usage counters"
+    ON ai_usage_counters FOR SELECT
+    USING (user_id = (SELECT auth.uid()));
+
+-- Increment the caller's counter for today and report whether it is still
+-- within max_per_day. One round-trip, atomic under concurrent requests.
+CREATE OR REPLACE FUNCTION public.bump_ai_usage(max_per_day INTEGER)
+RETURNS BOOLEAN
+LANGUAGE sql
+VOLATILE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    INSERT INTO ai_usage_counters (user_id, day, count)
+    VALUES (auth.uid(), CURRENT_DATE, 1)
+    ON CONFLICT (user_id, day)
+    DO UPDATE SET count = ai_usage_counters.count + 1
+    RETURNING count <= max_per_day
+$$;
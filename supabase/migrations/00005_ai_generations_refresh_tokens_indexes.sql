@@ -0,0 +1,16 @@
+-- ================================
+-- Composite indexes for per-user AI generation and refresh-token lookups
+-- ================================
+
+-- "Generations by user in a time window" (rate-limit fallback COUNT, history)
+-- becomes a bounded range scan. The leading user_id column also serves the
+-- plain user_id lookups, so the single-column index is dropped.
+CREATE INDEX idx_ai_generations_user_created ON ai_generations(user_id, created_at DESC);
+DROP INDEX idx_ai_generations_user_id;
+
+-- "Active refresh tokens for a user"
+CREATE INDEX idx_refresh_tokens_user_active ON refresh_tokens(user_id, revoked, expires_at);
+DROP INDEX idx_refresh_tokens_user_id;
+
+-- The UNIQUE constraint on token already provides an index
+DROP INDEX idx_refresh_tokens_token;
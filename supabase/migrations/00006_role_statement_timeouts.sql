@@ -0,0 +1,15 @@
+-- ================================
+-- Per-role statement and idle-transaction timeouts
+-- ================================
+-- PostgREST switches to these roles for every API request, so role-level
+-- settings cap how long a bad plan or a stuck transaction can hold a pooled
+-- connection. Values are pinned here rather than relying on platform defaults.
+
+ALTER ROLE anon SET statement_timeout = '3s';
+ALTER ROLE authenticated SET statement_timeout = '10s';
+
+ALTER ROLE anon SET idle_in_transaction_session_timeout = '30s';
+ALTER ROLE authenticated SET idle_in_transaction_session_timeout = '30s';
+
+-- Make PostgREST pick up the new role settings
+NOTIFY pgrst, 'reload config';
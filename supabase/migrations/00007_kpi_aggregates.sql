@@ -0,0 +1,84 @@
+-- ================================
+-- KPI aggregates
+-- ================================
+-- The dashboard KPIs used to download every usage_events / prompts row in
+-- the window and bucket them in the browser. These functions do the
+-- grouping in Postgres and return one row per bucket. They run as the
+-- caller (SECURITY INVOKER), so the existing RLS policies still apply.
+
+-- Executions, failures and averages per day or week (weeks start on Monday)
+CREATE OR REPLACE FUNCTION public.kpi_usage_trend(
+    period_days INTEGER DEFAULT 42,
+    bucket TEXT DEFAULT 'week'
+)
+RETURNS TABLE (
+    period TEXT,
+    executions BIGINT,
+    failures BIGINT,
+    avg_latency DOUBLE PRECISION,
+    avg_cost DOUBLE PRECISION
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT
+        to_char(date_trunc(bucket, created_at), 'YYYY-MM-DD') AS period,
+        COUNT(*) AS executions,
+        COUNT(*) FILTER (WHERE NOT success) AS failures,
+        AVG(COALESCE(latency_ms, 0))::DOUBLE PRECISION AS avg_latency,
+        AVG(COALESCE(cost, 0))::DOUBLE PRECISION AS avg_cost
+    FROM usage_events
+    WHERE created_at >= NOW() - make_interval(days => period_days)
+    GROUP BY 1
+    ORDER BY 1
+$$;
+
+-- Prompt versions created per month
+CREATE OR REPLACE FUNCTION public.kpi_version_velocity(months INTEGER DEFAULT 6)
+RETURNS TABLE (
+    month TEXT,
+    releases BIGINT
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT
+        to_char(date_trunc('month', created_at), 'YYYY-MM') AS month,
+        COUNT(*) AS releases
+    FROM prompts
+    WHERE created_at >= NOW() - make_interval(months => months)
+    GROUP BY 1
+    ORDER BY 1
+$$;
+
+-- Most executed prompt versions in the period
+CREATE OR REPLACE FUNCTION public.kpi_top_prompts(
+    max_results INTEGER DEFAULT 10,
+    period_days INTEGER DEFAULT 30
+)
+RETURNS TABLE (
+    name TEXT,
+    executions BIGINT,
+    success_rate DOUBLE PRECISION,
+    avg_cost DOUBLE PRECISION,
+    last_updated TIMESTAMPTZ
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT
+        p.name::TEXT,
+        COUNT(*) AS executions,
+        (COUNT(*) FILTER (WHERE e.success))::DOUBLE PRECISION / COUNT(*) AS success_rate,
+        AVG(COALESCE(e.cost, 0))::DOUBLE PRECISION AS avg_cost,
+        p.created_at AS last_updated
+    FROM usage_events e
+    JOIN prompts p ON p.id = e.prompt_id
+    WHERE e.created_at >= NOW() - make_interval(days => period_days)
+    GROUP BY p.id, p.name, p.created_at
+    ORDER BY executions DESC
+    LIMIT max_results
+$$;
@@ -0,0 +1,37 @@
+-- ================================
+-- KPI summary
+-- ================================
+-- The dashboard summary used to fire five separate count queries and pull
+-- every prompt's (name, version, active) to work out which prompts are
+-- active. This returns all five numbers from a single statement.
+--
+-- A materialized view would be cheaper still, but it bypasses RLS and would
+-- report the same totals to every user; the summary is scoped to what the
+-- caller can see, so this stays a SECURITY INVOKER function.
+
+CREATE OR REPLACE FUNCTION public.kpi_summary()
+RETURNS TABLE (
+    total_prompts BIGINT,
+    active_prompts BIGINT,
+    total_deployments BIGINT,
+    running_experiments BIGINT,
+    recent_usage BIGINT
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT
+        (SELECT COUNT(*) FROM prompts),
+        (
+            SELECT COUNT(*) FILTER (WHERE latest.active)
+            FROM (
+                SELECT DISTINCT ON (name) active
+                FROM prompts
+                ORDER BY name, version DESC
+            ) latest
+        ),
+        (SELECT COUNT(*) FROM deployments),
+        (SELECT COUNT(*) FROM ab_policies),
+        (SELECT COUNT(*) FROM usage_events WHERE created_at >= NOW() - INTERVAL '7 days')
+$$;
@@ -0,0 +1,27 @@
+-- ================================
+-- A/B experiment stats
+-- ================================
+-- get_experiment_stats used to download every assignment row of an
+-- experiment and count versions in the browser. This returns one row per
+-- version instead, counted from an index-only scan.
+
+-- Covers the per-experiment version counts; the old single-column index on
+-- experiment_name is a prefix of this one
+CREATE INDEX idx_ab_assignments_experiment_version ON ab_assignments(experiment_name, version);
+DROP INDEX IF EXISTS idx_ab_assignments_experiment;
+
+CREATE OR REPLACE FUNCTION public.ab_experiment_stats(experiment TEXT)
+RETURNS TABLE (
+    version INTEGER,
+    assignments BIGINT
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT a.version, COUNT(*) AS assignments
+    FROM ab_assignments a
+    WHERE a.experiment_name = experiment
+    GROUP BY a.version
+    ORDER BY a.version
+$$;
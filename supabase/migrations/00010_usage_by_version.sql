@@ -0,0 +1,39 @@
+-- ================================
+-- Usage analytics by version
+-- ================================
+-- get_analytics_by_version used to download every usage event of a prompt
+-- (one row per execution) and group them in the browser. This aggregates
+-- per version in the database and returns one row per version.
+--
+-- Versions without usage still appear, with a zero count, matching what
+-- the client-side grouping returned. Missing costs count as zero towards
+-- the average.
+
+CREATE OR REPLACE FUNCTION public.usage_by_version(
+    prompt TEXT,
+    min_version INTEGER DEFAULT NULL,
+    max_version INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    version INTEGER,
+    count BIGINT,
+    success_rate DOUBLE PRECISION,
+    avg_cost DOUBLE PRECISION
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT
+        p.version,
+        COUNT(u.id) AS count,
+        COALESCE(COUNT(u.id) FILTER (WHERE u.success)::DOUBLE PRECISION / NULLIF(COUNT(u.id), 0), 0) AS success_rate,
+        SUM(COALESCE(u.cost, 0))::DOUBLE PRECISION / NULLIF(COUNT(u.id), 0) AS avg_cost
+    FROM prompts p
+    LEFT JOIN usage_events u ON u.prompt_id = p.id
+    WHERE p.name = prompt
+      AND (min_version IS NULL OR p.version >= min_version)
+      AND (max_version IS NULL OR p.version <= max_version)
+    GROUP BY p.version
+    ORDER BY p.version
+$$;
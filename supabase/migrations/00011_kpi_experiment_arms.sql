@@ -0,0 +1,47 @@
+-- ================================
+-- KPI experiment arms
+-- ================================
+-- The dashboard's experiment summary used to download every assignment of
+-- every public experiment and count them in the browser, and it had no
+-- success rate per arm. This returns one row per (prompt, version) with
+-- both the assignment count and the success rate from usage_events.
+
+CREATE OR REPLACE FUNCTION public.kpi_experiment_arms()
+RETURNS TABLE (
+    prompt_name TEXT,
+    version INTEGER,
+    assignments BIGINT,
+    success_rate DOUBLE PRECISION
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    WITH experiment_prompts AS (
+        SELECT DISTINCT prompt_name FROM ab_policies WHERE is_public
+    ),
+    assignment_counts AS (
+        SELECT a.prompt_name, a.version, COUNT(*) AS assignments
+        FROM ab_assignments a
+        WHERE a.prompt_name IN (SELECT prompt_name FROM experiment_prompts)
+        GROUP BY a.prompt_name, a.version
+    ),
+    usage_stats AS (
+        SELECT
+            p.name AS prompt_name,
+            p.version,
+            COUNT(*) FILTER (WHERE u.success)::DOUBLE PRECISION / COUNT(*) AS success_rate
+        FROM prompts p
+        JOIN usage_events u ON u.prompt_id = p.id
+        WHERE p.name IN (SELECT prompt_name FROM experiment_prompts)
+        GROUP BY p.name, p.version
+    )
+    SELECT
+        COALESCE(a.prompt_name, s.prompt_name),
+        COALESCE(a.version, s.version),
+        COALESCE(a.assignments, 0),
+        s.success_rate
+    FROM assignment_counts a
+    FULL JOIN usage_stats s
+        ON s.prompt_name = a.prompt_name AND s.version = a.version
+$$;
@@ -0,0 +1,16 @@
+-- ================================
+-- Prompts latest-version index
+-- ================================
+-- "Latest version per prompt" lookups (DISTINCT ON (name) ... ORDER BY
+-- name, version DESC in kpi_summary, and ORDER BY version DESC for a
+-- single name in create_prompt and list_versions) could not use the
+-- (name, version) unique index in that mixed order and fell back to a sort.
+-- This index matches the order and carries `active`, so kpi_summary's
+-- active-prompt count is an index-only scan.
+--
+-- usage_events(created_at) is already indexed by the initial schema.
+
+CREATE INDEX idx_prompts_name_version_desc ON prompts(name, version DESC) INCLUDE (active);
+
+-- Prefix of both uq_prompt_name_version and the index above
+DROP INDEX IF EXISTS idx_prompts_name;
@@ -0,0 +1,135 @@
+-- ================================
+-- Daily usage rollups
+-- ================================
+-- kpi_usage_trend and kpi_top_prompts scanned every usage_events row in
+-- their window on each dashboard load, so they slowed down as usage grew.
+-- usage_daily_rollups keeps one row per prompt version per (UTC) day,
+-- maintained by a statement-level trigger on usage_events, and both
+-- functions now read from it. Their cost follows the number of prompts and
+-- days in the window rather than the number of executions.
+--
+-- Windows are now whole days: a 30-day window covers the last 30 calendar
+-- days including today, instead of exactly 30 * 24 hours back from now.
+
+CREATE TABLE usage_daily_rollups (
+    prompt_id BIGINT NOT NULL REFERENCES prompts(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    executions BIGINT NOT NULL DEFAULT 0,
+    failures BIGINT NOT NULL DEFAULT 0,
+    total_latency_ms BIGINT NOT NULL DEFAULT 0,
+    total_cost BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (prompt_id, day)
+);
+
+CREATE INDEX idx_usage_daily_rollups_day ON usage_daily_rollups(day);
+
+ALTER TABLE usage_daily_rollups ENABLE ROW LEVEL SECURITY;
+
+-- Same visibility as usage_events (writes go through the trigger)
+CREATE POLICY "Authenticated users can view usage rollups"
+    ON usage_daily_rollups FOR SELECT
+    USING (auth.uid() IS NOT NULL);
+
+-- Fold each inserted batch into the rollups with one upsert per statement,
+-- so multi-row inserts (record_usage_batch) touch each rollup row once
+CREATE OR REPLACE FUNCTION public.rollup_usage_events()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    INSERT INTO usage_daily_rollups AS r (prompt_id, day, executions, failures, total_latency_ms, total_cost)
+    SELECT
+        prompt_id,
+        (created_at AT TIME ZONE 'UTC')::DATE,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE NOT success),
+        SUM(COALESCE(latency_ms, 0)),
+        SUM(COALESCE(cost, 0))
+    FROM new_events
+    GROUP BY 1, 2
+    ON CONFLICT (prompt_id, day) DO UPDATE SET
+        executions = r.executions + EXCLUDED.executions,
+        failures = r.failures + EXCLUDED.failures,
+        total_latency_ms = r.total_latency_ms + EXCLUDED.total_latency_ms,
+        total_cost = r.total_cost + EXCLUDED.total_cost;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_usage_events_rollup
+    AFTER INSERT ON usage_events
+    REFERENCING NEW TABLE AS new_events
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION public.rollup_usage_events();
+
+-- Backfill from existing events
+INSERT INTO usage_daily_rollups (prompt_id, day, executions, failures, total_latency_ms, total_cost)
+SELECT
+    prompt_id,
+    (created_at AT TIME ZONE 'UTC')::DATE,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE NOT success),
+    SUM(COALESCE(latency_ms, 0)),
+    SUM(COALESCE(cost, 0))
+FROM usage_events
+GROUP BY 1, 2;
+
+-- Executions, failures and averages per day or week (weeks start on Monday)
+CREATE OR REPLACE FUNCTION public.kpi_usage_trend(
+    period_days INTEGER DEFAULT 42,
+    bucket TEXT DEFAULT 'week'
+)
+RETURNS TABLE (
+    period TEXT,
+    executions BIGINT,
+    failures BIGINT,
+    avg_latency DOUBLE PRECISION,
+    avg_cost DOUBLE PRECISION
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT
+        to_char(date_trunc(bucket, day), 'YYYY-MM-DD') AS period,
+        SUM(executions)::BIGINT AS executions,
+        SUM(failures)::BIGINT AS failures,
+        SUM(total_latency_ms)::DOUBLE PRECISION / SUM(executions) AS avg_latency,
+        SUM(total_cost)::DOUBLE PRECISION / SUM(executions) AS avg_cost
+    FROM usage_daily_rollups
+    WHERE day > (NOW() AT TIME ZONE 'UTC')::DATE - period_days
+    GROUP BY 1
+    ORDER BY 1
+$$;
+
+-- Most executed prompt versions in the period
+CREATE OR REPLACE FUNCTION public.kpi_top_prompts(
+    max_results INTEGER DEFAULT 10,
+    period_days INTEGER DEFAULT 30
+)
+RETURNS TABLE (
+    name TEXT,
+    executions BIGINT,
+    success_rate DOUBLE PRECISION,
+    avg_cost DOUBLE PRECISION,
+    last_updated TIMESTAMPTZ
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT
+        p.name::TEXT,
+        SUM(r.executions)::BIGINT AS executions,
+        (SUM(r.executions) - SUM(r.failures))::DOUBLE PRECISION / SUM(r.executions) AS success_rate,
+        SUM(r.total_cost)::DOUBLE PRECISION / SUM(r.executions) AS avg_cost,
+        p.created_at AS last_updated
+    FROM usage_daily_rollups r
+    JOIN prompts p ON p.id = r.prompt_id
+    WHERE r.day > (NOW() AT TIME ZONE 'UTC')::DATE - period_days
+    GROUP BY p.id, p.name, p.created_at
+    ORDER BY executions DESC
+    LIMIT max_results
+$$;
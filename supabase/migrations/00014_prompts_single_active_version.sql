@@ -0,0 +1,27 @@
+-- ================================
+-- One active version per prompt
+-- ================================
+-- Active-version lookups (get_active_prompt) and the deactivation before a
+-- new version is inserted both filter on (name, active = TRUE). A partial
+-- unique index makes both a single index probe and enforces the invariant
+-- the app relies on: at most one active version per prompt name.
+--
+-- The boolean idx_prompts_active index is too unselective to be used and
+-- is dropped.
+
+-- Keep only the latest active version active, in case concurrent updates
+-- ever left more than one
+UPDATE prompts p
+SET active = FALSE
+WHERE p.active
+  AND EXISTS (
+      SELECT 1
+      FROM prompts newer
+      WHERE newer.name = p.name
+        AND newer.active
+        AND newer.version > p.version
+  );
+
+CREATE UNIQUE INDEX uq_prompts_active_name ON prompts(name) WHERE active;
+
+DROP INDEX IF EXISTS idx_prompts_active;
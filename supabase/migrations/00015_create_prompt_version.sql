@@ -0,0 +1,44 @@
+-- ================================
+-- Create prompt version
+-- ================================
+-- create_prompt (and so update_prompt, rollback and clone_prompt) used
+-- three round-trips: read the latest version, deactivate it, insert the
+-- next one. Two concurrent updates could also read the same latest version
+-- and collide on uq_prompt_name_version. This does all three steps in one
+-- call, serialized per prompt name by a transaction-scoped advisory lock.
+--
+-- It runs as the caller, so the existing prompts RLS policies still decide
+-- who may deactivate and insert versions.
+
+CREATE OR REPLACE FUNCTION public.create_prompt_version(
+    prompt_name TEXT,
+    prompt_template TEXT,
+    prompt_variables JSONB DEFAULT '[]'::jsonb,
+    make_public BOOLEAN DEFAULT FALSE
+)
+RETURNS SETOF prompts
+LANGUAGE plpgsql
+VOLATILE
+SET search_path = public
+AS $$
+DECLARE
+    next_version INTEGER;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('prompts:' || prompt_name));
+
+    SELECT COALESCE(MAX(version), 0) + 1
+    INTO next_version
+    FROM prompts
+    WHERE name = prompt_name;
+
+    UPDATE prompts
+    SET active = FALSE
+    WHERE name = prompt_name
+      AND active;
+
+    RETURN QUERY
+    INSERT INTO prompts (name, template, variables, version, created_by, active, is_public)
+    VALUES (prompt_name, prompt_template, prompt_variables, next_version, auth.uid(), TRUE, make_public)
+    RETURNING *;
+END;
+$$;
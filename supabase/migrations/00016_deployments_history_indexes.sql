@@ -0,0 +1,19 @@
+-- ================================
+-- Deployment history indexes
+-- ================================
+-- Current-deployment and history reads filter on environment and order by
+-- (deployed_at DESC, id DESC), the keyset used to page history. With only
+-- single-column indexes Postgres had to collect an environment's
+-- deployments and sort them; these composite indexes return them already
+-- in order, so the current deployment is the first index entry and each
+-- history page reads only its own rows.
+--
+-- The second index serves the same reads scoped to one prompt, which join
+-- through prompt_id.
+
+CREATE INDEX idx_deployments_env_deployed_at ON deployments(environment, deployed_at DESC, id DESC);
+CREATE INDEX idx_deployments_prompt_env_deployed_at ON deployments(prompt_id, environment, deployed_at DESC);
+
+-- Prefixes of the indexes above
+DROP INDEX IF EXISTS idx_deployments_environment;
+DROP INDEX IF EXISTS idx_deployments_prompt_id;
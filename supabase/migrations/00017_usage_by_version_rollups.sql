@@ -0,0 +1,42 @@
+-- ================================
+-- Usage analytics by version from rollups
+-- ================================
+-- usage_by_version still joined every usage event of the prompt, so the
+-- per-version analytics got slower with every execution. usage_daily_rollups
+-- (00013) already keeps one row per prompt version per day, so the same
+-- numbers can be summed from those rows instead: the cost now follows the
+-- number of versions and active days, not the number of events.
+--
+-- The rollups are exact rather than refreshed on a schedule, so unlike a
+-- materialized view the results are never stale, and RLS still applies.
+-- Success rate and average cost are computed as before (missing costs
+-- count as zero; versions without usage report a zero count).
+
+CREATE OR REPLACE FUNCTION public.usage_by_version(
+    prompt TEXT,
+    min_version INTEGER DEFAULT NULL,
+    max_version INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    version INTEGER,
+    count BIGINT,
+    success_rate DOUBLE PRECISION,
+    avg_cost DOUBLE PRECISION
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT
+        p.version,
+        COALESCE(SUM(r.executions), 0)::BIGINT AS count,
+        COALESCE((SUM(r.executions) - SUM(r.failures))::DOUBLE PRECISION / NULLIF(SUM(r.executions), 0), 0) AS success_rate,
+        SUM(r.total_cost)::DOUBLE PRECISION / NULLIF(SUM(r.executions), 0) AS avg_cost
+    FROM prompts p
+    LEFT JOIN usage_daily_rollups r ON r.prompt_id = p.id
+    WHERE p.name = prompt
+      AND (min_version IS NULL OR p.version >= min_version)
+      AND (max_version IS NULL OR p.version <= max_version)
+    GROUP BY p.version
+    ORDER BY p.version
+$$;
@@ -0,0 +1,30 @@
+-- ================================
+-- Prompts visibility indexes
+-- ================================
+-- Prompt lists filter on visibility (public, owned by the viewer, or
+-- either) and order by created_at DESC. The only indexes on those columns
+-- were a boolean index on is_public, which is too unselective to use, and
+-- a plain created_by index, so each page filtered and then sorted.
+--
+-- These match the two visibility paths in the list order:
+--   - public prompts, newest first (a partial index; private rows are not
+--     in it at all)
+--   - one user's prompts, newest first
+-- Postgres can combine both for the public-or-owned listing.
+--
+-- The "view own prompts" policy is also rewritten to wrap auth.uid() in a
+-- scalar subquery, as 00003 did for the other policies, so it is evaluated
+-- once per statement and the comparison can use the owner index.
+
+CREATE INDEX idx_prompts_public_created_at ON prompts(created_at DESC) WHERE is_public;
+CREATE INDEX idx_prompts_created_by_created_at ON prompts(created_by, created_at DESC);
+
+-- Superseded by the two indexes above (the second still serves the
+-- created_by foreign key)
+DROP INDEX IF EXISTS idx_prompts_is_public;
+DROP INDEX IF EXISTS idx_prompts_created_by;
+
+DROP POLICY "Users can view own prompts" ON prompts;
+CREATE POLICY "Users can view own prompts"
+    ON prompts FOR SELECT
+    USING (created_by = (SELECT auth.uid()));
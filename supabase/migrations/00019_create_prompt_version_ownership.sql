@@ -0,0 +1,73 @@
+-- ================================
+-- Create prompt version: name ownership
+-- ================================
+-- create_prompt_version (00015) ran as the caller, so RLS hid other users'
+-- private versions from it. With uq_prompts_active_name (00014) that broke
+-- in two ways when the name was already taken by someone else:
+--   - MAX(version) missed their private versions, so the next number could
+--     collide with uq_prompt_name_version
+--   - the deactivating UPDATE could not touch their active row, so the
+--     INSERT failed on uq_prompts_active_name with a raw unique violation
+--
+-- The function now runs as its owner so it sees every version of the name,
+-- and enforces the rules RLS used to apply itself: the caller must be
+-- signed in, be an editor or admin (as the prompts INSERT policy requires),
+-- and a name belongs to the user who created it. A name taken by another
+-- user is rejected with a clear "already exists" error.
+
+CREATE OR REPLACE FUNCTION public.create_prompt_version(
+    prompt_name TEXT,
+    prompt_template TEXT,
+    prompt_variables JSONB DEFAULT '[]'::jsonb,
+    make_public BOOLEAN DEFAULT FALSE
+)
+RETURNS SETOF prompts
+LANGUAGE plpgsql
+VOLATILE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    caller UUID := auth.uid();
+    caller_role user_role := current_user_role();
+    next_version INTEGER;
+BEGIN
+    IF caller IS NULL THEN
+        RAISE EXCEPTION 'Not authenticated' USING ERRCODE = '42501';
+    END IF;
+
+    IF caller_role IS NULL OR caller_role NOT IN ('admin', 'editor') THEN
+        RAISE EXCEPTION 'You do not have permission to create prompts' USING ERRCODE = '42501';
+    END IF;
+
+    PERFORM pg_advisory_xact_lock(hashtext('prompts:' || prompt_name));
+
+    IF EXISTS (
+        SELECT 1
+        FROM prompts
+        WHERE name = prompt_name
+          AND created_by IS DISTINCT FROM caller
+    ) THEN
+        RAISE EXCEPTION 'A prompt named "%" already exists', prompt_name
+            USING ERRCODE = 'unique_violation';
+    END IF;
+
+    SELECT COALESCE(MAX(version), 0) + 1
+    INTO next_version
+    FROM prompts
+    WHERE name = prompt_name;
+
+    UPDATE prompts
+    SET active = FALSE
+    WHERE name = prompt_name
+      AND active;
+
+    RETURN QUERY
+    INSERT INTO prompts (name, template, variables, version, created_by, active, is_public)
+    VALUES (prompt_name, prompt_template, prompt_variables, next_version, caller, TRUE, make_public)
+    RETURNING *;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.create_prompt_version(TEXT, TEXT, JSONB, BOOLEAN) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.create_prompt_version(TEXT, TEXT, JSONB, BOOLEAN) TO authenticated;
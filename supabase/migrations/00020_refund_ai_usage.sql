@@ -0,0 +1,30 @@
+-- ================================
+-- Refund a failed AI request
+-- ================================
+-- The AI functions charge bump_ai_usage (00004) before calling the provider,
+-- so a provider error or timeout used to cost the caller a request from
+-- their daily budget. refund_ai_usage gives that request back.
+--
+-- The budget is a calendar-day (UTC) counter, not a rolling 24h window: it
+-- resets at midnight. A refund names the user and the day that was charged,
+-- so a request that fails after midnight does not credit the next day, and
+-- it never takes the counter below zero.
+--
+-- Only the edge functions (service role) may call it: a signed-in user able
+-- to run it could reset their own counter and bypass the limit.
+
+CREATE OR REPLACE FUNCTION public.refund_ai_usage(target_user_id UUID, charged_day DATE)
+RETURNS VOID
+LANGUAGE sql
+VOLATILE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    UPDATE ai_usage_counters
+    SET count = GREATEST(count - 1, 0)
+    WHERE user_id = target_user_id
+      AND day = charged_day
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.refund_ai_usage(UUID, DATE) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.refund_ai_usage(UUID, DATE) TO service_role;